@@ -4,8 +4,9 @@
 """
 
 import configparser
+import io
 import os
-from pathlib import Path
+import threading
 
 class Config:
     """配置管理类"""
@@ -17,6 +18,10 @@ class Config:
         
         self.config_file = config_file
         self.config = configparser.ConfigParser()
+        # 配置可能在后台线程中保存，写入和修改需要互斥
+        self._lock = threading.RLock()
+        # 写文件单独加锁：磁盘写入期间主线程仍可修改配置，多个后台保存依次写入
+        self._file_lock = threading.Lock()
         self.load_config()
     
     def load_config(self):
@@ -32,8 +37,13 @@ class Config:
     def save_config(self):
         """保存配置到文件"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                self.config.write(f)
+            with self._file_lock:
+                # 在内存中生成配置快照后即释放配置锁，不在持锁期间等待磁盘
+                with self._lock:
+                    buffer = io.StringIO()
+                    self.config.write(buffer)
+                with open(self.config_file, 'w', encoding='utf-8') as f:
+                    f.write(buffer.getvalue())
         except Exception as e:
             print(f"保存配置文件失败: {e}")
     
@@ -75,9 +85,21 @@ class Config:
     def set(self, key, value, section='Settings'):
         """设置配置值"""
         try:
-            if not self.config.has_section(section):
-                self.config.add_section(section)
-            self.config.set(section, key, str(value))
+            with self._lock:
+                if not self.config.has_section(section):
+                    self.config.add_section(section)
+                self.config.set(section, key, str(value))
+        except Exception as e:
+            print(f"设置配置失败: {e}")
+    
+    def set_many(self, values: dict, section='Settings'):
+        """一次设置多个配置值（只加锁一次，后台保存不会写入只更新了一部分的配置）"""
+        try:
+            with self._lock:
+                if not self.config.has_section(section):
+                    self.config.add_section(section)
+                for key, value in values.items():
+                    self.config.set(section, key, str(value))
         except Exception as e:
             print(f"设置配置失败: {e}")
     
@@ -121,9 +143,11 @@ class Config:
     
     def set_resolution_filter_config(self, enabled: bool, min_width: int, min_height: int):
         """设置分辨率过滤配置"""
-        self.set('enable_resolution_filter', str(enabled))
-        self.set('min_resolution_width', str(min_width))
-        self.set('min_resolution_height', str(min_height))
+        self.set_many({
+            'enable_resolution_filter': enabled,
+            'min_resolution_width': min_width,
+            'min_resolution_height': min_height,
+        })
     
     def get_sort_config(self):
         """获取排序配置"""
@@ -131,4 +155,8 @@ class Config:
     
     def set_sort_config(self, sort_option: str):
         """设置排序配置"""
-        self.set('file_sort_option', sort_option)
\ No newline at end of file
+        self.set('file_sort_option', sort_option)
+    
+    def get_natural_filename_sort(self):
+        """获取是否按自然顺序排序文件名（数字部分按数值比较）"""
+        return self.get_bool('natural_filename_sort', default=False)
\ No newline at end of file
@@ -4,7 +4,7 @@
 """
 
 import os
-from typing import Dict, List, Optional, Tuple
+from typing import List, Tuple
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -3,13 +3,91 @@
 负责文件和目录的读写操作
 """
 
+import locale
 import os
+import re
 import shutil
+import time
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any, Iterator, Callable, Collection, Set
 from PIL import Image
 from utils.pillow_wrapper import PillowWrapper
 
+# 排序配置 -> (排序字段, 是否降序)
+_SORT_OPTIONS = {
+    'file_size_desc': ('size', True),
+    'file_size_asc': ('size', False),
+    'width_desc': ('width', True),
+    'width_asc': ('width', False),
+    'height_desc': ('height', True),
+    'height_asc': ('height', False),
+    'filename_asc': ('filename', False),
+    'filename_desc': ('filename', True),
+}
+
+_DIGITS_RE = re.compile(r'(\d+)')
+
+# 输出格式 -> 文件扩展名
+_FORMAT_EXTENSIONS = {
+    'JPEG': '.jpg',
+    'PNG': '.png',
+    'WEBP': '.webp',
+    'BMP': '.bmp',
+    'TIFF': '.tiff'
+}
+
+
+def _filename_sort_key(file_path: str) -> str:
+    """文件名排序键（忽略大小写，按当前区域设置的排序规则）
+
+    strxfrm 在生成键时一次性完成区域排序转换，排序比较时只是普通字符串比较。
+    """
+    return locale.strxfrm(os.path.basename(file_path).lower())
+
+
+def _natural_filename_sort_key(file_path: str) -> tuple:
+    """文件名自然排序键，数字部分按数值比较（img2 排在 img10 之前）"""
+    parts = _DIGITS_RE.split(os.path.basename(file_path).lower())
+    # split 结果中奇数位置总是数字片段
+    return tuple(int(part) if i % 2 else locale.strxfrm(part) for i, part in enumerate(parts))
+
+
+def _scan_image_entries(directory: str, extensions: frozenset, recursive: bool) -> Iterator[os.DirEntry]:
+    """用 os.scandir 遍历目录，按扩展名筛选文件
+
+    DirEntry 自带文件类型，stat 结果也会缓存在 DirEntry 上，
+    不需要再对每个文件单独调用 isfile/getsize。无法访问的目录直接跳过。
+    """
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        yield from _scan_image_entries(entry.path, extensions, recursive)
+                elif entry.is_file():
+                    name = entry.name
+                    dot = name.rfind('.')
+                    if dot > 0 and name[dot:].lower() in extensions:
+                        yield entry
+    except OSError:
+        return
+
+
+class _ImageEntry:
+    """扫描得到的图片文件记录
+
+    使用 __slots__，每个文件只占一个紧凑对象；尺寸在首次需要时才读取，
+    同一次扫描内的过滤和排序直接读取属性，不再重复 stat。
+    """
+    __slots__ = ('size', 'mtime_ns', 'width', 'height')
+    
+    def __init__(self, size: int, mtime_ns: int):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.width: Optional[int] = None
+        self.height: Optional[int] = None
+
+
 class FileManager:
     """文件管理类"""
     
@@ -19,7 +97,15 @@ class FileManager:
         self.current_directory = ""
         self.current_files = []
         self.current_file_index = 0
+        # 当前文件索引或文件列表变化时的回调 (索引, 文件总数)
+        self.on_index_changed: Optional[Callable[[int, int], None]] = None
         self.pillow = PillowWrapper()
+        # 图片尺寸缓存：路径 -> (修改时间 ns, 宽, 高)，文件未修改时重复过滤/排序不再读取文件头
+        self._image_size_cache: Dict[str, Tuple[int, int, int]] = {}
+        # 最近一次扫描得到的文件记录：路径 -> _ImageEntry
+        self._scanned_entries: Dict[str, _ImageEntry] = {}
+        # 已确认存在的输出目录，批量处理时每个目录只 makedirs 一次
+        self._ensured_dirs: Set[str] = set()
     
     def get_supported_formats(self) -> List[str]:
         """获取支持的图片格式"""
@@ -27,12 +113,12 @@ class FileManager:
             return self.config.get_supported_formats()
         return ['.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp']
     
-    def is_image_file(self, file_path: str, format_filter: List[str] = None) -> bool:
+    def is_image_file(self, file_path: str, format_filter: Collection[str] = None) -> bool:
         """检查文件是否为支持的图片格式
 
         Args:
             file_path: 文件路径
-            format_filter: 格式筛选列表，如 ['.jpg', '.png']。None 表示不筛选
+            format_filter: 格式筛选扩展名集合，如 frozenset({'.jpg', '.png'})。None 表示不筛选
 
         Returns:
             bool: 是否符合格式要求
@@ -51,7 +137,7 @@ class FileManager:
         if os.path.isfile(file_path) and self.is_image_file(file_path):
             self.current_directory = os.path.dirname(file_path)
             self.current_files = [file_path]
-            self.current_file_index = 0
+            self._set_current_index(0)
             return file_path
         return None
     
@@ -72,22 +158,10 @@ class FileManager:
         self.current_files = []
         
         # 遍历目录查找图片文件
-        if recursive:
-            # 递归遍历所有子目录
-            for root, dirs, files in os.walk(directory_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if self.is_image_file(file_path):
-                        self.current_files.append(file_path)
-        else:
-            # 只遍历当前目录
-            for file in os.listdir(directory_path):
-                file_path = os.path.join(directory_path, file)
-                if os.path.isfile(file_path) and self.is_image_file(file_path):
-                    self.current_files.append(file_path)
+        self.current_files = self._scan_image_files(directory_path, recursive)
         
-        self.current_files.sort(key=lambda x: os.path.getsize(x), reverse=True)
-        self.current_file_index = 0
+        self.sort_files(self.current_files, 'file_size_desc')
+        self._set_current_index(0)
         return self.current_files
     
     def get_current_file(self) -> Optional[str]:
@@ -101,7 +175,7 @@ class FileManager:
         if not self.current_files:
             return None
         
-        self.current_file_index = (self.current_file_index + 1) % len(self.current_files)
+        self._set_current_index((self.current_file_index + 1) % len(self.current_files))
         return self.get_current_file()
     
     def get_previous_file(self) -> Optional[str]:
@@ -109,9 +183,28 @@ class FileManager:
         if not self.current_files:
             return None
         
-        self.current_file_index = (self.current_file_index - 1) % len(self.current_files)
+        self._set_current_index((self.current_file_index - 1) % len(self.current_files))
         return self.get_current_file()
     
+    def get_adjacent_files(self) -> List[str]:
+        """获取当前文件前后相邻的文件（用于预加载）
+
+        Returns:
+            list: 下一个和上一个文件路径，文件不足两个时为空列表
+        """
+        count = len(self.current_files)
+        if count < 2:
+            return []
+        
+        index = self.current_file_index
+        adjacent = [self.current_files[(index + 1) % count], self.current_files[(index - 1) % count]]
+        # 只有两个文件时前后是同一个文件
+        return list(dict.fromkeys(adjacent))
+    
+    def get_files_slice(self, start: int, end: int) -> List[str]:
+        """获取当前文件列表中 [start, end) 范围内的文件（用于列表分段显示）"""
+        return self.current_files[start:end]
+    
     def get_file_count(self) -> int:
         """获取文件总数"""
         return len(self.current_files)
@@ -123,7 +216,13 @@ class FileManager:
     def set_current_index(self, index: int):
         """设置当前文件索引"""
         if 0 <= index < len(self.current_files):
-            self.current_file_index = index
+            self._set_current_index(index)
+    
+    def _set_current_index(self, index: int):
+        """更新当前文件索引并通知监听者"""
+        self.current_file_index = index
+        if self.on_index_changed:
+            self.on_index_changed(index, len(self.current_files))
     
     def get_output_path(self, input_path: str, output_mode: str, 
                        output_dir: str = None, output_format: str = None) -> str:
@@ -144,15 +243,7 @@ class FileManager:
         
         # 如果指定了输出格式，修改文件扩展名
         if output_format and output_format != "保持原格式":
-            # 格式映射
-            format_extensions = {
-                'JPEG': '.jpg',
-                'PNG': '.png',
-                'WEBP': '.webp',
-                'BMP': '.bmp',
-                'TIFF': '.tiff'
-            }
-            ext = format_extensions.get(output_format, ext)
+            ext = _FORMAT_EXTENSIONS.get(output_format, ext)
             filename = f"{name}{ext}"
         
         if output_mode == 'overwrite':
@@ -170,15 +261,25 @@ class FileManager:
             output_folder = os.path.join(input_dir, output_dir or 'processed_images')
             
             # 创建输出文件夹
-            os.makedirs(output_folder, exist_ok=True)
+            self._ensure_dir(output_folder)
             return os.path.join(output_folder, filename)
         
         elif output_mode == 'custom_dir' and output_dir:
-            os.makedirs(output_dir, exist_ok=True)
+            self._ensure_dir(output_dir)
             return os.path.join(output_dir, filename)
         
         return input_path
     
+    def _ensure_dir(self, directory: str):
+        """创建目录（已确认存在的目录不再重复创建）"""
+        if directory not in self._ensured_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._ensured_dirs.add(directory)
+    
+    def reset_output_dirs(self):
+        """清空已确认存在的输出目录记录（每次处理开始时调用，目录可能已在两次处理之间被删除）"""
+        self._ensured_dirs.clear()
+    
     def create_backup(self, file_path: str) -> Optional[str]:
         """创建文件备份"""
         if not os.path.exists(file_path):
@@ -194,7 +295,6 @@ class FileManager:
         
         # 如果备份文件已存在，添加时间戳
         if os.path.exists(backup_path):
-            import time
             timestamp = time.strftime("%Y%m%d_%H%M%S")
             backup_filename = f"{name}_backup_{timestamp}{ext}"
             backup_path = os.path.join(backup_dir, backup_filename)
@@ -206,6 +306,38 @@ class FileManager:
             print(f"创建备份失败: {e}")
             return None
     
+    def _scan_image_files(self, directory_path: str, recursive: bool,
+                          format_filter: Collection[str] = None) -> List[str]:
+        """扫描目录中的图片文件
+
+        Args:
+            directory_path: 目录路径
+            recursive: 是否递归读取子目录
+            format_filter: 格式筛选扩展名集合，None 表示使用所有支持的格式
+
+        Returns:
+            list: 图片文件路径列表
+        """
+        extensions = frozenset(ext.lower() for ext in (
+            format_filter if format_filter is not None else self.get_supported_formats()))
+        scanned = {}
+        for entry in _scan_image_entries(directory_path, extensions, recursive):
+            try:
+                # DirEntry 缓存 stat 结果，Windows 上直接来自目录列表，无需额外系统调用
+                stat = entry.stat()
+            except OSError:
+                continue
+            scanned[entry.path] = _ImageEntry(stat.st_size, stat.st_mtime_ns)
+        self._scanned_entries = scanned
+        return list(scanned)
+    
+    def get_file_size(self, file_path: str) -> int:
+        """获取文件大小，优先使用扫描记录"""
+        entry = self._scanned_entries.get(file_path)
+        if entry is not None:
+            return entry.size
+        return os.path.getsize(file_path)
+    
     def check_image_resolution(self, file_path: str, min_width: int, min_height: int) -> bool:
         """检查图片分辨率是否符合要求
         
@@ -217,15 +349,9 @@ class FileManager:
         Returns:
             bool: 是否符合分辨率要求
         """
-        try:
-            image_info = self.pillow.get_image_info(file_path)
-            if image_info and 'width' in image_info and 'height' in image_info:
-                width = image_info['width']
-                height = image_info['height']
-                return width >= min_width and height >= min_height
-            return False
-        except Exception:
-            return False
+        width, height = self.get_image_size(file_path)
+        # 无法读取的文件尺寸为 (0, 0)，始终视为不符合
+        return width > 0 and width >= min_width and height >= min_height
     
     def select_directory_with_filter(self, directory_path: str, recursive: bool = True, 
                                    resolution_filter: Dict[str, Any] = None) -> List[str]:
@@ -246,20 +372,7 @@ class FileManager:
         self.current_files = []
         
         # 获取所有图片文件
-        all_files = []
-        if recursive:
-            # 递归遍历所有子目录
-            for root, dirs, files in os.walk(directory_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if self.is_image_file(file_path):
-                        all_files.append(file_path)
-        else:
-            # 只遍历当前目录
-            for file in os.listdir(directory_path):
-                file_path = os.path.join(directory_path, file)
-                if os.path.isfile(file_path) and self.is_image_file(file_path):
-                    all_files.append(file_path)
+        all_files = self._scan_image_files(directory_path, recursive)
         
         # 应用分辨率过滤
         if resolution_filter and resolution_filter.get('enabled', False):
@@ -273,22 +386,41 @@ class FileManager:
             # 不应用分辨率过滤
             self.current_files = all_files
         
-        self.current_files.sort(key=lambda x: os.path.getsize(x), reverse=True)
-        self.current_file_index = 0
+        self.sort_files(self.current_files, 'file_size_desc')
+        self._set_current_index(0)
         return self.current_files
     
     def select_directory_with_filter_and_sort(self, directory_path: str, recursive: bool = True,
                                              resolution_filter: Dict[str, Any] = None,
                                              sort_config: str = None,
-                                             format_filter: List[str] = None) -> List[str]:
+                                             format_filter: Collection[str] = None) -> List[str]:
         """选择目录并获取所有支持的图片文件（带分辨率过滤和排序）
 
+        参数同 scan_directory_with_filter_and_sort，扫描完成后设为当前文件列表。
+
+        Returns:
+            list: 过滤和排序后的图片文件路径列表
+        """
+        if not os.path.isdir(directory_path):
+            return []
+
+        files = self.scan_directory_with_filter_and_sort(
+            directory_path, recursive, resolution_filter, sort_config, format_filter)
+        self.set_directory_files(directory_path, files)
+        return files
+
+    def scan_directory_with_filter_and_sort(self, directory_path: str, recursive: bool = True,
+                                           resolution_filter: Dict[str, Any] = None,
+                                           sort_config: str = None,
+                                           format_filter: Collection[str] = None) -> List[str]:
+        """扫描目录，返回过滤和排序后的图片文件列表（不修改当前目录和文件列表，可在后台线程调用）
+
         Args:
             directory_path: 目录路径
             recursive: 是否递归读取子目录
             resolution_filter: 分辨率过滤配置 {'enabled': bool, 'min_width': int, 'min_height': int}
             sort_config: 排序配置，支持的值：file_size_desc, file_size_asc, width_desc, width_asc, height_desc, height_asc, filename_asc, filename_desc
-            format_filter: 格式筛选列表，如 ['.jpg', '.png']。None 表示不筛选
+            format_filter: 格式筛选扩展名集合，如 frozenset({'.jpg', '.png'})。None 表示不筛选
 
         Returns:
             list: 过滤和排序后的图片文件路径列表
@@ -296,78 +428,96 @@ class FileManager:
         if not os.path.isdir(directory_path):
             return []
 
-        self.current_directory = directory_path
-        self.current_files = []
-
         # 获取所有图片文件（应用格式筛选）
-        all_files = []
-        if recursive:
-            # 递归遍历所有子目录
-            for root, dirs, files in os.walk(directory_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if self.is_image_file(file_path, format_filter):
-                        all_files.append(file_path)
-        else:
-            # 只遍历当前目录
-            for file in os.listdir(directory_path):
-                file_path = os.path.join(directory_path, file)
-                if os.path.isfile(file_path) and self.is_image_file(file_path, format_filter):
-                    all_files.append(file_path)
+        files = self._scan_image_files(directory_path, recursive, format_filter)
 
         # 应用分辨率过滤
         if resolution_filter and resolution_filter.get('enabled', False):
             min_width = resolution_filter.get('min_width', 0)
             min_height = resolution_filter.get('min_height', 0)
-
-            for file_path in all_files:
-                if self.check_image_resolution(file_path, min_width, min_height):
-                    self.current_files.append(file_path)
-        else:
-            # 不应用分辨率过滤
-            self.current_files = all_files
+            files = [file_path for file_path in files
+                     if self.check_image_resolution(file_path, min_width, min_height)]
 
         # 应用排序
-        if sort_config and self.current_files:
-            # 根据排序配置进行排序
-            if sort_config == "file_size_desc":
-                self.current_files.sort(key=lambda x: os.path.getsize(x), reverse=True)
-            elif sort_config == "file_size_asc":
-                self.current_files.sort(key=lambda x: os.path.getsize(x), reverse=False)
-            elif sort_config == "width_desc":
-                self.current_files.sort(key=lambda x: self.get_image_width(x), reverse=True)
-            elif sort_config == "width_asc":
-                self.current_files.sort(key=lambda x: self.get_image_width(x), reverse=False)
-            elif sort_config == "height_desc":
-                self.current_files.sort(key=lambda x: self.get_image_height(x), reverse=True)
-            elif sort_config == "height_asc":
-                self.current_files.sort(key=lambda x: self.get_image_height(x), reverse=False)
-            elif sort_config == "filename_asc":
-                self.current_files.sort(key=lambda x: os.path.basename(x).lower(), reverse=False)
-            elif sort_config == "filename_desc":
-                self.current_files.sort(key=lambda x: os.path.basename(x).lower(), reverse=True)
-            else:
-                # 默认按文件大小降序
-                self.current_files.sort(key=lambda x: os.path.getsize(x), reverse=True)
+        if sort_config and files:
+            self.sort_files(files, sort_config)
 
-        self.current_file_index = 0
-        return self.current_files
+        return files
+
+    def set_directory_files(self, directory_path: str, files: List[str]):
+        """设置当前目录和文件列表（扫描结果在主线程一次性替换），并回到第一张
+
+        Args:
+            directory_path: 目录路径
+            files: scan_directory_with_filter_and_sort 返回的文件列表
+        """
+        self.current_directory = directory_path
+        self.current_files = files
+        self._set_current_index(0)
     
-    def get_image_width(self, file_path: str) -> int:
-        """获取图片宽度"""
+    def sort_files(self, files: List[str], sort_config: str):
+        """按排序配置原地排序文件列表
+
+        排序键通过 key= 计算，每个文件只计算一次，不会在比较时重复计算。
+
+        Args:
+            files: 文件路径列表
+            sort_config: 排序配置，未知值按文件大小降序
+        """
+        sort_field, reverse = _SORT_OPTIONS.get(sort_config, _SORT_OPTIONS['file_size_desc'])
+        files.sort(key=self._get_sort_key(sort_field), reverse=reverse)
+    
+    def _get_sort_key(self, sort_field: str):
+        """获取排序字段对应的排序键函数"""
+        if sort_field == 'size':
+            return self.get_file_size
+        if sort_field == 'width':
+            return self.get_image_width
+        if sort_field == 'height':
+            return self.get_image_height
+        if self.config and self.config.get_natural_filename_sort():
+            return _natural_filename_sort_key
+        return _filename_sort_key
+    
+    def get_image_size(self, file_path: str) -> Tuple[int, int]:
+        """获取图片尺寸（按修改时间缓存，只读取文件头不解码像素）
+
+        Returns:
+            tuple: (宽, 高)，无法读取时为 (0, 0)
+        """
+        entry = self._scanned_entries.get(file_path)
+        if entry is not None:
+            if entry.width is None:
+                entry.width, entry.height = self._read_image_size(file_path, entry.mtime_ns)
+            return entry.width, entry.height
+        
+        try:
+            mtime_ns = os.stat(file_path).st_mtime_ns
+        except OSError:
+            return 0, 0
+        return self._read_image_size(file_path, mtime_ns)
+    
+    def _read_image_size(self, file_path: str, mtime_ns: int) -> Tuple[int, int]:
+        """读取图片尺寸，文件修改时间未变时使用缓存"""
+        cached = self._image_size_cache.get(file_path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1], cached[2]
+        
         try:
             with Image.open(file_path) as img:
-                return img.width
+                width, height = img.size
         except Exception:
-            return 0
+            width, height = 0, 0
+        self._image_size_cache[file_path] = (mtime_ns, width, height)
+        return width, height
+    
+    def get_image_width(self, file_path: str) -> int:
+        """获取图片宽度"""
+        return self.get_image_size(file_path)[0]
     
     def get_image_height(self, file_path: str) -> int:
         """获取图片高度"""
-        try:
-            with Image.open(file_path) as img:
-                return img.height
-        except Exception:
-            return 0
+        return self.get_image_size(file_path)[1]
     
     def get_file_info(self, file_path: str) -> dict:
         """获取文件信息"""
@@ -4,10 +4,12 @@
 """
 
 import os
-import threading
 import json
 import shutil
-from typing import Dict, List, Optional, Callable, Any
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
+from typing import Dict, List, Optional, Callable, Any, Mapping
 from utils.pillow_wrapper import PillowWrapper
 from utils.tinypng_client import TinyPNGClient
 from core.file_manager import FileManager
@@ -15,17 +17,41 @@ from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 批量处理的最大并行线程数（Pillow 解码、缩放和编码时释放 GIL，TinyPNG 压缩为网络 I/O）
+_MAX_BATCH_WORKERS = min(4, os.cpu_count() or 1)
+
+# 批量处理进度回调的最小间隔（秒），最后一个文件完成时总会回调
+_PROGRESS_CALLBACK_INTERVAL = 0.033
+
+
+def _compression_ratio(input_size: int, output_size: int) -> float:
+    """计算压缩率（百分比），大小未知（为 0）时返回 0"""
+    if input_size > 0 and output_size > 0:
+        return (1 - output_size / input_size) * 100
+    return 0
+
 class ImageProcessor:
     """图片处理核心类"""
     
-    def __init__(self, config=None):
-        """初始化图片处理器"""
+    def __init__(self, config=None, file_manager: Optional[FileManager] = None):
+        """初始化图片处理器
+        
+        Args:
+            config: 配置管理器
+            file_manager: 共用的文件管理器，不提供时自行创建
+        """
         self.config = config
-        self.file_manager = FileManager(config)
+        self.file_manager = file_manager if file_manager is not None else FileManager(config)
         self.pillow = PillowWrapper()
         self.tinypng = None
         self.processing_callback = None
         self.stop_processing = False
+        # 处理类型 -> 处理方法，参数为 (输入路径, 输出路径, 处理参数)
+        self._process_handlers: Dict[str, Callable[[str, str, Mapping[str, Any]], Dict[str, Any]]] = {
+            'resize': self._process_resize,
+            'compress': self._process_compress,
+            'pillow_compress': self._process_pillow_compress,
+        }
         
         # 初始化TinyPNG客户端
         if config:
@@ -106,7 +132,7 @@ class ImageProcessor:
                     'error': None,
                     'input_size': input_size,
                     'output_size': output_size,
-                    'compression_ratio': (1 - output_size / input_size) * 100,
+                    'compression_ratio': _compression_ratio(input_size, output_size),
                     'original_info': original_info
                 }
             else:
@@ -197,7 +223,7 @@ class ImageProcessor:
                     'error': None,
                     'input_size': input_size,
                     'output_size': output_size,
-                    'compression_ratio': (1 - output_size / input_size) * 100,
+                    'compression_ratio': _compression_ratio(input_size, output_size),
                     'original_info': original_info
                 }
             else:
@@ -254,7 +280,7 @@ class ImageProcessor:
                     'error': None,
                     'input_size': input_size,
                     'output_size': output_size,
-                    'compression_ratio': (1 - output_size / input_size) * 100,
+                    'compression_ratio': _compression_ratio(input_size, output_size),
                     'original_info': original_info
                 }
             else:
@@ -273,6 +299,32 @@ class ImageProcessor:
                 'output_size': 0
             }
     
+    def _process_resize(self, input_path: str, output_path: str,
+                        process_params: Mapping[str, Any]) -> Dict[str, Any]:
+        """按处理参数调整分辨率"""
+        return self.resize_image(
+            input_path, output_path,
+            process_params.get('resize_mode', 'percentage'),
+            process_params.get('resize_value', 50),
+            process_params.get('quality', 85),
+            process_params.get('maintain_aspect', True)
+        )
+    
+    def _process_compress(self, input_path: str, output_path: str,
+                          process_params: Mapping[str, Any]) -> Dict[str, Any]:
+        """使用TinyPNG压缩（无额外参数）"""
+        return self.compress_image_tinypng(input_path, output_path)
+    
+    def _process_pillow_compress(self, input_path: str, output_path: str,
+                                 process_params: Mapping[str, Any]) -> Dict[str, Any]:
+        """按处理参数进行Pillow压缩"""
+        return self.compress_image_pillow(
+            input_path, output_path,
+            process_params.get('quality', 85),
+            process_params.get('mode', 'optimize'),
+            process_params.get('scale')
+        )
+    
     def process_single_image(self, input_path: str, output_path: str, 
                            process_type: str, process_params: Dict[str, Any]) -> Dict[str, Any]:
         """处理单张图片
@@ -298,26 +350,11 @@ class ImageProcessor:
                 temp_path = os.path.join(temp_dir, temp_name)
                 
                 # 根据处理类型执行相应的操作，结果存储到临时文件
-                if process_type == 'resize':
-                    result = self.resize_image(
-                        input_path, temp_path,
-                        process_params.get('resize_mode', 'percentage'),
-                        process_params.get('resize_value', 50),
-                        process_params.get('quality', 85),
-                        process_params.get('maintain_aspect', True)
-                    )
-                elif process_type == 'compress':
-                    result = self.compress_image_tinypng(input_path, temp_path)
-                elif process_type == 'pillow_compress':
-                    result = self.compress_image_pillow(
-                        input_path, temp_path,
-                        process_params.get('quality', 85),
-                        process_params.get('mode', 'optimize'),
-                        process_params.get('scale')
-                    )
+                handler = self._process_handlers.get(process_type)
+                if handler is not None:
+                    result = handler(input_path, temp_path, process_params)
                 elif process_type == 'format_convert':
                     # 纯格式转换，不做其他处理，直接复制到临时文件
-                    import shutil
                     shutil.copy2(input_path, temp_path)
                     
                     # 获取原始文件信息作为结果
@@ -374,7 +411,7 @@ class ImageProcessor:
                             'error': None,
                             'input_size': result['input_size'],  # 使用原始输入大小
                             'output_size': format_result['output_size'],  # 使用格式转换后的输出大小
-                            'compression_ratio': (1 - format_result['output_size'] / result['input_size']) * 100,
+                            'compression_ratio': _compression_ratio(result['input_size'], format_result['output_size']),
                             'original_info': result.get('original_info', format_result.get('original_info', {}))
                         }
                         
@@ -398,31 +435,15 @@ class ImageProcessor:
                     # 如果前面的处理失败或只是格式转换，直接返回结果
                     if temp_path and os.path.exists(temp_path) and temp_path != output_path:
                         try:
-                            import shutil
                             shutil.move(temp_path, output_path)
                         except:
                             pass
                     return result
             else:
                 # 不需要格式转换，直接处理
-                result = None
-                if process_type == 'resize':
-                    result = self.resize_image(
-                        input_path, output_path,
-                        process_params.get('resize_mode', 'percentage'),
-                        process_params.get('resize_value', 50),
-                        process_params.get('quality', 85),
-                        process_params.get('maintain_aspect', True)
-                    )
-                elif process_type == 'compress':
-                    result = self.compress_image_tinypng(input_path, output_path)
-                elif process_type == 'pillow_compress':
-                    result = self.compress_image_pillow(
-                        input_path, output_path,
-                        process_params.get('quality', 85),
-                        process_params.get('mode', 'optimize'),
-                        process_params.get('scale')
-                    )
+                handler = self._process_handlers.get(process_type)
+                if handler is not None:
+                    result = handler(input_path, output_path, process_params)
                 else:
                     result = {
                         'success': False,
@@ -453,8 +474,8 @@ class ImageProcessor:
     
     def process_multiple_images(self, input_paths: List[str], output_mode: str,
                               process_type: str, process_params: Dict[str, Any],
-                              output_dir: str = None) -> List[Dict[str, Any]]:
-        """批量处理图片
+                              output_dir: str = None, max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """批量处理图片（多个文件在线程池中并行处理）
         
         Args:
             input_paths: 输入图片路径列表
@@ -462,58 +483,110 @@ class ImageProcessor:
             process_type: 处理类型
             process_params: 处理参数
             output_dir: 输出目录
+            max_workers: 最大并行线程数，默认为 _MAX_BATCH_WORKERS
             
         Returns:
-            list: 处理结果列表
+            list: 处理结果列表（按输入顺序排列）
         """
         results = []
         total_files = len(input_paths)
+        # 同一批次中每个输出目录只创建一次
+        self.file_manager.reset_output_dirs()
+        output_format = process_params.get('output_format')
+        # 所有文件共用同一份参数：以只读视图传给各工作线程，不复制也不会被某个文件的处理修改
+        process_params = MappingProxyType(process_params)
         
+        # 输出路径（及输出目录）在处理开始前于当前线程中一次生成，每个输出目录只创建一次
+        get_output_path = self.file_manager.get_output_path
+        tasks = []
         for i, input_path in enumerate(input_paths):
-            if self.stop_processing:
-                break
-            
+            # 不存在的文件（如加载列表后被删除）直接记为失败，不再提交处理
+            if not os.path.isfile(input_path):
+                results.append(self._batch_error_result(input_path, i, '输入文件不存在'))
+                continue
             try:
-                # 获取输出格式
-                output_format = process_params.get('output_format')
-                
-                # 获取输出路径
-                output_path = self.file_manager.get_output_path(
-                    input_path, output_mode, output_dir, output_format
-                )
-                
-                # 处理图片
-                result = self.process_single_image(
-                    input_path, output_path, process_type, process_params
-                )
-                
-                # 添加文件信息
-                result['input_path'] = input_path
-                result['output_path'] = output_path
-                result['file_index'] = i
-                
+                output_path = get_output_path(input_path, output_mode, output_dir, output_format)
+            except OSError as e:
+                results.append(self._batch_error_result(input_path, i, str(e)))
+                continue
+            tasks.append((i, input_path, output_path))
+        
+        # 多个输入写到同一输出文件时（如不同目录下的同名文件），并行会互相覆盖临时文件，改为逐个处理
+        workers = max_workers or _MAX_BATCH_WORKERS
+        if len({output_path for _, _, output_path in tasks}) < len(tasks):
+            workers = 1
+        
+        # 循环中使用的方法提前取出（停止标志和进度回调可能在处理中被其他线程修改，需每次读取）
+        process_item = self._process_batch_item
+        # 未提交处理的文件（不存在或无法创建输出目录）也计入进度
+        completed = len(results)
+        last_report = 0.0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch-process") as executor:
+            submit = executor.submit
+            futures = {
+                submit(process_item, i, input_path, output_path, process_type, process_params): input_path
+                for i, input_path, output_path in tasks
+            }
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                result = future.result()
+                if result is None:
+                    continue
                 results.append(result)
+                completed += 1
                 
                 # 调用进度回调
-                if self.processing_callback:
-                    self.processing_callback(input_path, i + 1, total_files)
-                    
-            except Exception as e:
-                results.append({
-                    'success': False,
-                    'error': str(e),
-                    'input_path': input_path,
-                    'output_path': '',
-                    'input_size': 0,
-                    'output_size': 0,
-                    'file_index': i
-                })
+                callback = self.processing_callback
+                now = time.monotonic()
+                if callback and (now - last_report >= _PROGRESS_CALLBACK_INTERVAL or completed == total_files):
+                    last_report = now
+                    callback(futures[future], completed, total_files)
+                
+                if self.stop_processing:
+                    # 丢弃尚未开始的文件，正在处理的文件完成后退出
+                    for pending in futures:
+                        pending.cancel()
         
         # 重置停止标志
         self.stop_processing = False
         
+        results.sort(key=lambda result: result['file_index'])
         return results
     
+    def _process_batch_item(self, index: int, input_path: str, output_path: str,
+                            process_type: str, process_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """处理批量任务中的单个文件（在线程池中执行，已停止时返回 None）"""
+        if self.stop_processing:
+            return None
+        
+        # process_single_image 内部已将异常转换为失败结果
+        result = self.process_single_image(
+            input_path, output_path, process_type, process_params
+        )
+        
+        # 批量结果只用于统计和记录输出路径，不保留每个文件的图片信息字典
+        result.pop('original_info', None)
+        
+        # 添加文件信息
+        result['input_path'] = input_path
+        result['output_path'] = output_path
+        result['file_index'] = index
+        return result
+    
+    @staticmethod
+    def _batch_error_result(input_path: str, index: int, error: str) -> Dict[str, Any]:
+        """批量处理中单个文件失败时的结果"""
+        return {
+            'success': False,
+            'error': error,
+            'input_path': input_path,
+            'output_path': '',
+            'input_size': 0,
+            'output_size': 0,
+            'file_index': index
+        }
+    
     def get_image_info(self, image_path: str) -> Optional[Dict[str, Any]]:
         """获取图片信息
         
@@ -535,7 +608,11 @@ class ImageProcessor:
             bool: 是否有效
         """
         try:
-            client = TinyPNGClient(api_key)
+            # 与当前客户端密钥相同时复用其连接
+            if self.tinypng is not None and self.tinypng.api_key == api_key:
+                client = self.tinypng
+            else:
+                client = TinyPNGClient(api_key)
             return client.validate_api_key()
         except Exception:
             return False
@@ -547,7 +624,9 @@ class ImageProcessor:
             api_key: API密钥
         """
         if api_key and api_key != 'your_tinypng_api_key_here':
-            self.tinypng = TinyPNGClient(api_key)
+            # 密钥未变化时保留现有客户端（及其 HTTP 连接池），不在每次处理前重建
+            if self.tinypng is None or self.tinypng.api_key != api_key:
+                self.tinypng = TinyPNGClient(api_key)
         else:
             self.tinypng = None
     
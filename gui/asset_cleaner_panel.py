@@ -7,9 +7,6 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
 import threading
-from typing import Optional
-
-from utils.asset_cleaner import clean_start, size_start
 
 
 class AssetCleanerPanel:
@@ -283,7 +280,8 @@ class AssetCleanerPanel:
             self._update_results(f"正在分析类型: {analysis_type}\n")
             self._update_results("正在扫描文件...\n")
             
-            # 执行分析
+            # 执行分析（分析模块在首次运行时才导入）
+            from utils.asset_cleaner import clean_start, size_start
             if analysis_type == "clean":
                 delete_unused = self.delete_unused_var.get()
                 self._update_results(f"删除未使用资源: {'是' if delete_unused else '否'}\n")
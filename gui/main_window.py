@@ -4,11 +4,11 @@
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
+from tkinter import ttk, messagebox, filedialog
 import os
-import threading
-from typing import Optional, List, Dict, Any
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any
 
 from core.image_processor import ImageProcessor
 from core.file_manager import FileManager
@@ -17,10 +17,55 @@ from gui.managers.status_bar_manager import StatusBarManager
 from gui.managers.preview_manager import PreviewManager
 from gui.managers.file_manager_view import FileManagerView
 from gui.managers.process_control_manager import ProcessControlManager
+from utils.common_utils import format_file_size
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 处理结果缓存的最大条目数，超出后淘汰最久未使用的记录
+_MAX_PROCESSED_RESULTS = 512
+
+# 导航防抖延迟（毫秒），连续切换图片时只加载最后一张
+_NAVIGATION_DEBOUNCE_MS = 80
+
+# 批量处理进度的最短刷新间隔（毫秒），约每秒 30 次
+_BATCH_PROGRESS_INTERVAL_MS = 33
+
+# 状态栏文本模板（只显示文件名，不显示完整路径）
+_LOADED_STATUS = "已加载: {}".format
+_PROGRESS_STATUS = "正在处理: {} ({}/{})".format
+
+
+def _summarize_batch_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    统计批量处理结果（在处理线程中调用，一次遍历完成）
+    
+    Returns:
+        dict: success_count、total_count，成功结果的 total_input_size、total_output_size，
+            以及需要记录的 processed_paths（最后 _MAX_PROCESSED_RESULTS 个成功结果的 (输入路径, 输出路径)）
+    """
+    success_count = 0
+    total_input_size = 0
+    total_output_size = 0
+    # 处理结果缓存只保留最近的记录，更早的结果无需交给主线程
+    processed_paths = deque(maxlen=_MAX_PROCESSED_RESULTS)
+    for result in results:
+        if result['success']:
+            success_count += 1
+            if result.get('output_path') and result.get('input_path'):
+                processed_paths.append((result['input_path'], result['output_path']))
+            input_size = result.get('input_size', 0)
+            if input_size > 0:
+                total_input_size += input_size
+                total_output_size += result.get('output_size', 0)
+    return {
+        'success_count': success_count,
+        'total_count': len(results),
+        'total_input_size': total_input_size,
+        'total_output_size': total_output_size,
+        'processed_paths': list(processed_paths),
+    }
+
 
 class ImageProcessorGUI:
     """图像处理器主窗口类（协调器）"""
@@ -35,18 +80,34 @@ class ImageProcessorGUI:
         """
         self.root = root
         self.config = config
-        self.processor = ImageProcessor(config)
         self.file_manager = FileManager(config)
+        # 处理器与界面共用同一个文件管理器（输出路径、扫描缓存等）
+        self.processor = ImageProcessor(config, self.file_manager)
+        # 进度回调只在批量处理中调用，创建时注册一次即可
+        self.processor.set_processing_callback(self.on_batch_progress)
         
         # 当前文件相关
         self.current_image_path = ""
-        
-        # 处理相关
-        self.processing_thread = None
+        # 等待加载的导航任务（after 返回的 id）
+        self._navigation_after_id = None
+        
+        # 处理相关：处理任务在常驻的工作线程中执行，不再每次点击创建新线程
+        # 各管理器各自持有线程池而不共用一个执行器：目录扫描和配置写盘依赖单线程的提交顺序，
+        # 耗时的处理任务也不能占住预览解码和目录扫描的线程；关闭时的处理也不同
+        # （扫描、解码取消排队中的任务，配置写盘和处理任务让已提交的任务执行完）
+        self._processing_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-processing")
+        self.processing_future = None
         self.is_processing = False
+        # 最近一次批量处理进度 (文件路径, 当前序号, 总数)，由处理线程写入、主线程合并显示
+        # 只有处理线程写入（每次整体替换为新的元组），主线程只读不清空，读写无需加锁：
+        # 主线程读取和处理线程写入交错时，新进度不会被清掉，至多由下一次刷新显示
+        self._pending_batch_progress = None
+        self._batch_progress_scheduled = False
+        # 主线程最近一次显示的进度，与待显示的进度相同时跳过刷新
+        self._shown_batch_progress = None
         
         # 处理结果缓存
-        self.processed_results = {}  # 存储输入路径到输出路径的映射
+        self.processed_results: "OrderedDict[str, str]" = OrderedDict()  # 输入路径到输出路径的映射（LRU）
         
         # 设置窗口标题
         self.root.title("ImageForge - 图像处理器")
@@ -91,6 +152,8 @@ class ImageProcessorGUI:
         
         # 主框架布局
         self.main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        # 窗口关闭时不再接受新的处理任务（正在执行的任务会在退出前完成）
+        self.main_frame.bind('<Destroy>', self._on_destroy)
         
         # 配置主框架网格权重
         self.main_frame.columnconfigure(0, weight=2)  # 左侧内容区域
@@ -103,13 +166,13 @@ class ImageProcessorGUI:
         self.create_asset_cleaner_panel()
         
         # 现在可以创建文件管理视图了（因为需要asset_cleaner_panel）
-        self.file_manager_view = FileManagerView(
-            self.main_frame, self.config, self.file_manager, self.asset_cleaner_panel
-        )
+        self.file_manager_view = FileManagerView(self.config, self.file_manager, self.asset_cleaner_panel)
+        self.file_manager_view.initialize(self.main_frame)
         self.file_manager_view.set_callbacks(
             on_file_selected=self.on_file_selected,
             on_navigation=self.on_navigation,
-            on_filter_changed=self.on_filter_changed
+            on_filter_changed=self.on_filter_changed,
+            on_scan_started=self.on_scan_started
         )
         
         # 放置文件选择区域（跨越两列）
@@ -132,7 +195,7 @@ class ImageProcessorGUI:
         left_frame.columnconfigure(0, weight=1)
         
         # 创建预览管理器（使用 left_frame 作为父容器）
-        self.preview_manager = PreviewManager(left_frame, self.config, self.processor)
+        self.preview_manager = PreviewManager(left_frame, self.config)
         self.preview_manager.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
         
         # 创建处理控制管理器（使用 left_frame 作为父容器）
@@ -163,7 +226,6 @@ class ImageProcessorGUI:
     
     def select_folder_dialog(self, title="选择文件夹"):
         """统一的文件夹选择对话框"""
-        from tkinter import filedialog
         return filedialog.askdirectory(title=title)
     
     def set_directory_from_asset_cleaner(self, directory_path):
@@ -172,34 +234,34 @@ class ImageProcessorGUI:
             self.file_manager_view.set_file_path(directory_path)
             self.processed_results.clear()
             
+            # 与选择文件夹共用同一个后台扫描队列，扫描完成后再刷新界面
             filters = self.file_manager_view.get_current_filters()
-            files = self.file_manager.select_directory_with_filter_and_sort(
-                directory_path, filters['recursive'], 
-                filters['resolution'], filters['sort'], filters['format']
-            )
+            self.file_manager_view.scan_directory(
+                directory_path, filters,
+                lambda files: self._on_synced_directory_scanned(directory_path, files, filters))
+    
+    def _on_synced_directory_scanned(self, directory_path: str, files: List[str], filters: Dict[str, Any]):
+        """资源清理面板同步的文件夹扫描完成"""
+        if files:
+            self.load_image(files[0])
+            self.file_manager_view.update_navigation_buttons()
+            self.process_control.enable_batch_processing(True)
             
-            if files:
-                self.load_image(files[0])
-                self.file_manager_view.update_navigation_buttons()
-                self.file_manager_view.update_file_count_label()
-                self.process_control.enable_batch_processing(True)
-                
-                parts = [f"已同步并加载 {len(files)} 个图片文件"]
-                if filters['recursive']:
-                    parts.append("及其子目录")
-                if filters['resolution']['enabled']:
-                    parts.append(f"(分辨率≥{filters['resolution']['min_width']}×{filters['resolution']['min_height']})")
-                
-                self.status_bar.set_status("".join(parts))
-            else:
-                self.current_image_path = ""
-                self.preview_manager.clear_all()
-                self.process_control.enable_processing(False)
-                self.process_control.enable_batch_processing(False)
-                self.file_manager_view.update_navigation_buttons()
-                self.file_manager_view.update_file_count_label()
-                
-                self.status_bar.set_status(f"已同步到文件夹: {directory_path} (无支持的图片文件)")
+            parts = [f"已同步并加载 {len(files)} 个图片文件"]
+            if filters['recursive']:
+                parts.append("及其子目录")
+            if filters['resolution']['enabled']:
+                parts.append(f"(分辨率≥{filters['resolution']['min_width']}×{filters['resolution']['min_height']})")
+            
+            self.status_bar.set_status("".join(parts))
+        else:
+            self.current_image_path = ""
+            self.preview_manager.clear_all()
+            self.process_control.enable_processing(False)
+            self.process_control.enable_batch_processing(False)
+            self.file_manager_view.update_navigation_buttons()
+            
+            self.status_bar.set_status(f"已同步到文件夹: {directory_path} (无支持的图片文件)")
     
     def on_file_selected(self, file_path: str, is_single: bool = True, all_files: List[str] = None):
         """文件选择回调"""
@@ -208,7 +270,6 @@ class ImageProcessorGUI:
         
         if not is_single and all_files:
             self.file_manager_view.update_navigation_buttons()
-            self.file_manager_view.update_file_count_label()
             self.process_control.enable_batch_processing(True)
             
             filters = self.file_manager_view.get_current_filters()
@@ -218,36 +279,51 @@ class ImageProcessorGUI:
             if filters['resolution']['enabled']:
                 parts.append(f"(分辨率≥{filters['resolution']['min_width']}×{filters['resolution']['min_height']})")
             if filters['format']:
-                format_name = "、".join([ext.replace('.', '') for ext in filters['format']])
+                format_name = "、".join(ext.replace('.', '') for ext in sorted(filters['format']))
                 parts.append(f"(仅{format_name}格式)")
             
             self.status_bar.set_status("".join(parts))
     
     def on_navigation(self, file_path: str):
-        """导航回调"""
-        self.load_image(file_path)
+        """导航回调（防抖：快速连续切换时只加载最后一张）"""
+        # 当前路径立即更新，防抖期间开始处理也作用于最新选中的图片
+        self.current_image_path = file_path
+        if self._navigation_after_id:
+            self.root.after_cancel(self._navigation_after_id)
+        self._navigation_after_id = self.root.after(_NAVIGATION_DEBOUNCE_MS, self.load_image, file_path)
+    
+    def on_scan_started(self):
+        """开始扫描目录：取消尚未执行的导航加载，扫描完成前禁用处理按钮"""
+        if self._navigation_after_id:
+            self.root.after_cancel(self._navigation_after_id)
+            self._navigation_after_id = None
+        if not self.is_processing:
+            # 扫描完成后由加载图片和各完成回调重新启用
+            self.process_control.enable_processing(False)
+            self.process_control.enable_batch_processing(False)
     
     def on_filter_changed(self):
-        """过滤选项变化回调"""
+        """过滤选项变化回调（在后台重新扫描当前文件夹）"""
         if not self.file_manager.current_directory:
             return
         
         filters = self.file_manager_view.get_current_filters()
-        files = self.file_manager.select_directory_with_filter_and_sort(
-            self.file_manager.current_directory, filters['recursive'],
-            filters['resolution'], filters['sort'], filters['format']
-        )
-        
+        self.file_manager_view.scan_directory(
+            self.file_manager.current_directory, filters,
+            lambda files: self._on_filter_rescanned(files, filters))
+    
+    def _on_filter_rescanned(self, files: List[str], filters: Dict[str, Any]):
+        """过滤变化后的重新扫描完成"""
         if files:
             # 保留仍在列表中的处理结果
             current_files_set = set(files)
-            self.processed_results = {
-                k: v for k, v in self.processed_results.items() if k in current_files_set
-            }
+            self.processed_results = OrderedDict(
+                (k, v) for k, v in self.processed_results.items() if k in current_files_set
+            )
             
             self.load_image(files[0])
             self.file_manager_view.update_navigation_buttons()
-            self.file_manager_view.update_file_count_label()
+            self.process_control.enable_batch_processing(True)
             
             parts = [f"已重新加载 {len(files)} 个图片文件"]
             if filters['recursive']:
@@ -266,6 +342,10 @@ class ImageProcessorGUI:
     
     def load_image(self, image_path: str):
         """加载图片"""
+        # 直接加载（如选择了新文件夹）时取消尚未执行的导航加载
+        if self._navigation_after_id:
+            self.root.after_cancel(self._navigation_after_id)
+            self._navigation_after_id = None
         try:
             self.current_image_path = image_path
             self.file_manager_view.set_file_path(image_path)
@@ -274,13 +354,17 @@ class ImageProcessorGUI:
             self.preview_manager.display_original(image_path)
             
             # 检查是否有处理结果
-            if image_path in self.processed_results:
-                processed_path = self.processed_results[image_path]
-                if os.path.exists(processed_path):
-                    self.preview_manager.display_processed(processed_path)
-                else:
+            processed_path = self.processed_results.get(image_path)
+            if processed_path is not None:
+                self.processed_results.move_to_end(image_path)
+                # 用一次 stat 同时判断存在性，并交给预览复用（修改时间和文件大小）
+                try:
+                    processed_stat = os.stat(processed_path)
+                except FileNotFoundError:
                     self.preview_manager.clear_processed()
                     del self.processed_results[image_path]
+                else:
+                    self.preview_manager.display_processed(processed_path, processed_stat)
             else:
                 self.preview_manager.clear_processed()
             
@@ -288,7 +372,10 @@ class ImageProcessorGUI:
             self.process_control.enable_processing(True)
             
             # 更新状态
-            self.status_bar.set_status(f"已加载: {os.path.basename(image_path)}")
+            self.status_bar.set_status(_LOADED_STATUS(os.path.basename(image_path)))
+            
+            # 预加载前后相邻的图片，加快上一张/下一张的切换
+            self.preview_manager.prefetch(self.file_manager.get_adjacent_files())
             
         except Exception as e:
             logger.error(f"加载图片失败: {image_path}, 错误: {e}")
@@ -307,31 +394,37 @@ class ImageProcessorGUI:
         if process_params is None:
             return
         
-        self.processing_thread = threading.Thread(
-            target=self._process_image_thread,
-            args=(self.current_image_path, process_params)
-        )
-        self.processing_thread.start()
-    
-    def _process_image_thread(self, image_path, process_params):
-        """处理图片的线程函数"""
+        # 在主线程中切换处理状态，避免处理线程启动前再次点击重复开始
         self.is_processing = True
         self.process_control.set_processing_state(True)
+        self.status_bar.set_status("正在处理...")
+        self.processing_future = self._processing_pool.submit(
+            self._process_image_thread, self.current_image_path, process_params, *self._get_process_options()
+        )
+    
+    def _get_process_options(self):
+        """
+        在主线程中读取处理方式和输出设置（Tk 变量只应在主线程访问），供处理线程使用
         
+        Returns:
+            tuple: (处理方式, 输出方式, 输出目录)
+        """
+        process_type = self.process_control.get_process_type()
+        output_mode = self.process_control.get_output_mode()
+        output_dir = self.process_control.get_output_directory() if output_mode == "custom_dir" else None
+        return process_type, output_mode, output_dir
+    
+    def _process_image_thread(self, image_path, process_params, process_type, output_mode, output_dir):
+        """处理图片的线程函数"""
         try:
-            process_type = self.process_control.get_process_type()
-            output_mode = self.process_control.get_output_mode()
-            
             output_format = process_params.get('output_format')
             
-            output_dir = self.process_control.get_output_directory() if output_mode == "custom_dir" else None
+            self.file_manager.reset_output_dirs()
             output_path = self.file_manager.get_output_path(image_path, output_mode, output_dir, output_format)
             
             if output_mode == "overwrite":
                 self.file_manager.create_backup(image_path)
             
-            self.root.after(0, lambda: self.status_bar.set_status("正在处理..."))
-            
             result = self.processor.process_single_image(
                 image_path, output_path, process_type, process_params
             )
@@ -340,16 +433,23 @@ class ImageProcessorGUI:
             
         except Exception as e:
             logger.exception(f"处理图片时发生错误: {image_path}")
-            self.root.after(0, lambda: self.on_process_error(str(e)))
+            self.root.after(0, self.on_process_error, str(e))
         
         finally:
             self.is_processing = False
             self.root.after(0, lambda: self.process_control.set_processing_state(False))
     
+    def _remember_result(self, input_path: str, output_path: str):
+        """记录处理结果（超出上限时淘汰最久未使用的记录）"""
+        self.processed_results[input_path] = output_path
+        self.processed_results.move_to_end(input_path)
+        if len(self.processed_results) > _MAX_PROCESSED_RESULTS:
+            self.processed_results.popitem(last=False)
+    
     def on_process_complete(self, result, output_path):
         """处理完成回调"""
         if result['success']:
-            self.processed_results[self.current_image_path] = output_path
+            self._remember_result(self.current_image_path, output_path)
             self.preview_manager.display_processed(output_path)
             
             input_size = result['input_size']
@@ -388,32 +488,27 @@ class ImageProcessorGUI:
         
         result = messagebox.askyesno("确认批量处理", f"确定要处理 {len(files)} 个图片文件吗？")
         if result:
-            self.processor.set_processing_callback(self.on_batch_progress)
-            self.processing_thread = threading.Thread(
-                target=self._batch_process_thread,
-                args=(files, process_params)
+            self.is_processing = True
+            self._pending_batch_progress = None
+            self._shown_batch_progress = None
+            self.process_control.set_processing_state(True)
+            self.processing_future = self._processing_pool.submit(
+                self._batch_process_thread, files, process_params, *self._get_process_options()
             )
-            self.processing_thread.start()
     
-    def _batch_process_thread(self, files, process_params):
+    def _batch_process_thread(self, files, process_params, process_type, output_mode, output_dir):
         """批量处理线程函数"""
-        self.is_processing = True
-        self.process_control.set_processing_state(True)
-        
         try:
-            process_type = self.process_control.get_process_type()
-            output_mode = self.process_control.get_output_mode()
-            output_dir = self.process_control.get_output_directory() if output_mode == "custom_dir" else None
-            
             results = self.processor.process_multiple_images(
                 files, output_mode, process_type, process_params, output_dir
             )
             
-            self.root.after(0, lambda: self.on_batch_process_complete(results))
+            stats = _summarize_batch_results(results)
+            self.root.after(0, lambda: self.on_batch_process_complete(results, stats))
             
         except Exception as e:
             logger.exception("批量处理时发生错误")
-            self.root.after(0, lambda: self.on_batch_process_error(str(e)))
+            self.root.after(0, self.on_batch_process_error, str(e))
         
         finally:
             self.is_processing = False
@@ -421,31 +516,41 @@ class ImageProcessorGUI:
             self.root.after(0, lambda: self.status_bar.reset_progress())
     
     def on_batch_progress(self, file_path, current, total):
-        """批量处理进度回调"""
+        """批量处理进度回调（在处理线程中调用，只记录最新进度，界面按固定间隔在主线程更新）"""
+        self._pending_batch_progress = (file_path, current, total)
+        if not self._batch_progress_scheduled:
+            self._batch_progress_scheduled = True
+            self.root.after(_BATCH_PROGRESS_INTERVAL_MS, self._flush_batch_progress)
+    
+    def _flush_batch_progress(self):
+        """显示最新的批量处理进度"""
+        self._batch_progress_scheduled = False
+        pending = self._pending_batch_progress
+        if pending is None or pending is self._shown_batch_progress or not self.is_processing:
+            # 没有新进度，或处理已结束（进度条已重置）
+            return
+        self._shown_batch_progress = pending
+        file_path, current, total = pending
         progress = (current / total) * 100
         self.status_bar.set_progress(progress)
-        self.status_bar.set_status(f"正在处理: {os.path.basename(file_path)} ({current}/{total})")
+        self.status_bar.set_status(_PROGRESS_STATUS(os.path.basename(file_path), current, total))
     
-    def on_batch_process_complete(self, results):
-        """批量处理完成回调"""
-        success_count = sum(1 for r in results if r['success'])
-        total_count = len(results)
-        
-        # 保存处理结果
-        for result in results:
-            if result['success'] and result.get('output_path') and result.get('input_path'):
-                self.processed_results[result['input_path']] = result['output_path']
-        
-        # 计算统计信息
-        total_input_size = 0
-        total_output_size = 0
-        successful_results = [r for r in results if r['success'] and r.get('input_size', 0) > 0]
+    def on_batch_process_complete(self, results, stats):
+        """
+        批量处理完成回调
         
-        for result in successful_results:
-            total_input_size += result.get('input_size', 0)
-            total_output_size += result.get('output_size', 0)
+        Args:
+            results: 处理结果列表
+            stats: 处理线程中由 _summarize_batch_results 统计的结果
+        """
+        success_count = stats['success_count']
+        total_count = stats['total_count']
+        total_input_size = stats['total_input_size']
+        total_output_size = stats['total_output_size']
         
-        from utils.common_utils import format_file_size
+        # 保存处理结果
+        for input_path, output_path in stats['processed_paths']:
+            self._remember_result(input_path, output_path)
         
         message_lines = [f"批量处理完成！", f"成功: {success_count}/{total_count}"]
         if success_count < total_count:
@@ -454,7 +559,7 @@ class ImageProcessorGUI:
         
         status_summary_parts = [f"批量处理完成! 成功: {success_count}/{total_count}"]
         
-        if successful_results and total_input_size > 0:
+        if total_input_size > 0:
             saved_size = total_input_size - total_output_size
             saved_percentage = (saved_size / total_input_size) * 100
             
@@ -485,8 +590,15 @@ class ImageProcessorGUI:
         self.status_bar.set_status("批量处理失败")
         messagebox.showerror("批量处理错误", error_message)
     
+    def _on_destroy(self, event):
+        """主框架销毁时停止接收处理任务，并解除处理器对界面的进度回调"""
+        self._processing_pool.shutdown(wait=False)
+        self.processor.set_processing_callback(None)
+    
     def connect_process_control(self):
         """连接处理控制管理器的处理方法"""
-        # 替换process_control中的占位方法，使按钮能够调用主窗口的处理逻辑
-        self.process_control.process_image = self.process_image
-        self.process_control.batch_process_images = self.batch_process_images
\ No newline at end of file
+        # 设置处理按钮调用的主窗口处理逻辑
+        self.process_control.set_process_handlers(
+            on_process=self.process_image,
+            on_batch_process=self.batch_process_images
+        )
\ No newline at end of file
@@ -3,20 +3,79 @@
 管理文件选择、导航、过滤和排序
 """
 
+import json
+import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from typing import Optional, Callable, Dict, Any, List
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Callable, Dict, Any, FrozenSet, List
+from utils.common_utils import format_file_size
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 过滤选项变化的防抖延迟（毫秒），连续输入只在停止后触发一次保存和重新扫描
+_FILTER_DEBOUNCE_MS = 300
+
+# 配置写盘延迟（毫秒），一段时间内的多次修改只写一次文件
+_CONFIG_SAVE_DELAY_MS = 500
+
+# 格式筛选下拉框选项（同时用作下拉框取值和 _FORMAT_MAP 的键）
+_FORMAT_OPTIONS = (
+    "全部格式", "仅JPEG", "仅PNG", "仅BMP", "仅GIF", "仅TIFF", "仅WEBP")
+
+# 格式筛选选项 -> 扩展名（None 表示不筛选）
+_FORMAT_MAP = dict(zip(_FORMAT_OPTIONS, (
+    None, frozenset({'.jpg', '.jpeg'}), frozenset({'.png'}), frozenset({'.bmp'}),
+    frozenset({'.gif'}), frozenset({'.tiff'}), frozenset({'.webp'}))))
+
+# 保存配置失败时错误日志的最小间隔（秒），避免连续输入时反复写日志
+_SAVE_ERROR_LOG_INTERVAL = 1.0
+
+# 文件列表可见行数，列表中只插入可见范围内的条目
+_FILE_LIST_ROWS = 6
+
+# 格式筛选选项 -> 文件对话框的 filetypes（导入时一次性生成）
+_FILETYPES_BY_FORMAT = {
+    name: ((f"{name.replace('仅', '')}文件", " ".join(f"*{ext}" for ext in sorted(exts))), ("所有文件", "*.*"))
+    if exts else
+    (("所有文件", "*.*"), ("图片文件", "*.jpg *.jpeg *.png *.bmp *.gif *.tiff *.webp"))
+    for name, exts in _FORMAT_MAP.items()
+}
+
+# 排序下拉框选项（同时用作下拉框取值和 _SORT_OPTION_MAP 的键）
+_SORT_OPTIONS = (
+    "按文件大小(大到小)", "按文件大小(小到大)",
+    "按分辨率宽度(大到小)", "按分辨率宽度(小到大)",
+    "按分辨率高度(大到小)", "按分辨率高度(小到大)",
+    "按文件名(A-Z)", "按文件名(Z-A)")
+
+# 排序选项显示文本 -> 排序配置
+_SORT_OPTION_MAP = dict(zip(_SORT_OPTIONS, (
+    "file_size_desc", "file_size_asc", "width_desc", "width_asc",
+    "height_desc", "height_asc", "filename_asc", "filename_desc")))
+
+# 排序配置 -> 排序选项显示文本
+_SORT_OPTION_REVERSE = {v: k for k, v in _SORT_OPTION_MAP.items()}
+
+# 默认选项：不筛选格式，按文件大小降序
+_DEFAULT_FORMAT_OPTION = _FORMAT_OPTIONS[0]
+_DEFAULT_SORT_CONFIG = "file_size_desc"
+_DEFAULT_SORT_OPTION = _SORT_OPTION_REVERSE[_DEFAULT_SORT_CONFIG]
+
+
+def _safe_int(s: str, default: int) -> int:
+    """将输入框文本转为整数，编辑中途的空串或非数字直接返回默认值而不抛异常"""
+    return int(s) if s.isdecimal() else default
+
 
 class FileManagerView:
     """文件管理视图管理器类"""
     
-    def __init__(self, parent: tk.Widget, config, file_manager, asset_cleaner_panel=None):
-        """初始化文件管理视图管理器"""
-        self.parent = parent
+    def __init__(self, config, file_manager, asset_cleaner_panel=None):
+        """初始化文件管理视图管理器（只保存引用，组件在 initialize 中创建）"""
+        self.parent = None
         self.config = config
         self.file_manager = file_manager
         self.asset_cleaner_panel = asset_cleaner_panel
@@ -25,13 +84,25 @@ class FileManagerView:
         self.on_file_selected_callback = None
         self.on_navigation_callback = None
         self.on_filter_changed_callback = None
+        # 开始扫描目录时调用（扫描期间文件列表不可用，主窗口借此暂停导航和处理）
+        self.on_scan_started_callback = None
         
         # UI 组件
         self.file_frame = None
         self.file_path_var = None
+        self.file_path_entry = None
+        self.select_file_btn = None
+        self.select_folder_btn = None
         self.prev_btn = None
         self.next_btn = None
         self.file_count_label = None
+        self.file_count_var = None
+        # 计数标签当前显示的文本，未变化时不再写入 Tk 变量
+        self._file_count_text = "0/0"
+        self.file_tree = None
+        self.file_list_scrollbar = None
+        # 文件列表当前显示的文件索引范围 [start, end)
+        self._visible_range = (0, 0)
         
         # 过滤和排序选项
         self.recursive_var = None
@@ -48,130 +119,255 @@ class FileManagerView:
         self.format_hint_label = None
         self.sort_hint_label = None
         
+        # 待执行的过滤变化任务（after 返回的 id）
+        self._filter_debounce_id = None
+        # 是否有尚未应用的过滤变化
+        self._filters_dirty = False
+        # 上次扫描使用的目录和过滤条件（序列化后比较）
+        self._last_applied_filters = None
+        # 待执行的配置写盘任务
+        self._save_after_id = None
+        # 上次记录保存失败日志的时间（time.monotonic）
+        self._last_save_error_time = 0.0
+        # 目录扫描在单独的线程中执行，避免阻塞界面；所有重新扫描都提交到这里，依次执行
+        self._scan_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dir-scan")
+        # 扫描序号：每次提交扫描加一，完成时已有更新扫描的结果直接丢弃
+        self._scan_generation = 0
+        # 是否有尚未完成的扫描（扫描期间 FileManager 的文件列表正在重建，不响应文件列表操作）
+        self._scanning = False
+        # 配置写盘在常驻的后台线程中依次执行，不再每次保存创建新线程
+        # （线程池的工作线程在退出程序时会被等待，配置文件不会被截断）
+        self._save_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="config-save")
+    
+    def initialize(self, parent: tk.Widget):
+        """在父容器中创建文件管理组件"""
+        self.parent = parent
         self._create_widgets()
         self._setup_layout()
+        # 文件索引和列表由 FileManager 推送，导航时无需手动刷新计数
+        self.file_manager.on_index_changed = self._on_index_changed
     
     def _create_widgets(self):
         """创建文件管理组件"""
         self.file_frame = ttk.LabelFrame(self.parent, text="文件选择", padding="5")
         
-        # 文件路径显示和按钮
+        # 文件路径显示和按钮（路径输入框跨越选项行使用的前三列）
         self.file_path_var = tk.StringVar()
-        file_path_entry = ttk.Entry(self.file_frame, textvariable=self.file_path_var, width=60)
-        file_path_entry.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 10))
+        self.file_path_entry = ttk.Entry(self.file_frame, textvariable=self.file_path_var, width=60)
+        self.file_path_entry.grid(row=0, column=0, columnspan=3, sticky=(tk.W, tk.E), padx=(0, 10))
         
-        select_file_btn = ttk.Button(self.file_frame, text="选择文件", command=self._select_single_file)
-        select_file_btn.grid(row=0, column=1, padx=(0, 5))
+        self.select_file_btn = ttk.Button(self.file_frame, text="选择文件", command=self._select_single_file)
+        self.select_file_btn.grid(row=0, column=3, padx=(0, 5))
         
-        select_folder_btn = ttk.Button(self.file_frame, text="选择文件夹", command=self._select_directory)
-        select_folder_btn.grid(row=0, column=2, padx=(0, 5))
+        self.select_folder_btn = ttk.Button(self.file_frame, text="选择文件夹", command=self._select_directory)
+        self.select_folder_btn.grid(row=0, column=4, padx=(0, 5))
         
         self.prev_btn = ttk.Button(self.file_frame, text="上一张", command=self._show_previous_image, state=tk.DISABLED)
-        self.prev_btn.grid(row=0, column=3, padx=(0, 5))
+        self.prev_btn.grid(row=0, column=5, padx=(0, 5))
         
         self.next_btn = ttk.Button(self.file_frame, text="下一张", command=self._show_next_image, state=tk.DISABLED)
-        self.next_btn.grid(row=0, column=4)
+        self.next_btn.grid(row=0, column=6)
         
-        self.file_count_label = ttk.Label(self.file_frame, text="0/0")
-        self.file_count_label.grid(row=0, column=5, padx=(10, 0))
+        self.file_count_var = tk.StringVar(value=self._file_count_text)
+        self.file_count_label = ttk.Label(self.file_frame, textvariable=self.file_count_var)
+        self.file_count_label.grid(row=0, column=7, padx=(10, 0))
         
+        # 选项行直接放在 file_frame 的网格中：第0列为开关/标题，第1列为输入控件，第2列为提示
         self._create_recursive_options()
         self._create_resolution_filter_options()
         self._create_format_filter_options()
         self._create_sort_options()
+        self._create_file_list()
+        
+        self.file_frame.columnconfigure(2, weight=1)
         
-        self.file_frame.columnconfigure(0, weight=1)
+        # 窗口关闭时写入尚未保存的配置
+        self.file_frame.bind('<Destroy>', self._on_destroy)
+    
+    def _create_hint_label(self, text: str, row: int) -> ttk.Label:
+        """创建选项行的灰色提示文字"""
+        label = ttk.Label(self.file_frame, text=text, foreground="gray", font=("Arial", 9))
+        label.grid(row=row, column=2, columnspan=6, sticky=tk.W, padx=(10, 0), pady=(2, 2))
+        return label
     
     def _create_recursive_options(self):
         """创建递归选项"""
-        recursive_frame = ttk.Frame(self.file_frame)
-        recursive_frame.grid(row=1, column=0, columnspan=6, sticky=(tk.W, tk.E), pady=(2, 2))
-        
         self.recursive_var = tk.BooleanVar(value=True)
-        recursive_check = ttk.Checkbutton(recursive_frame, text="递归读取子目录", 
+        recursive_check = ttk.Checkbutton(self.file_frame, text="递归读取子目录", 
                                         variable=self.recursive_var, command=self._on_recursive_change)
-        recursive_check.pack(side=tk.LEFT, padx=(0, 10))
+        recursive_check.grid(row=1, column=0, sticky=tk.W, padx=(0, 10), pady=(2, 2))
         
-        self.recursive_hint_label = ttk.Label(recursive_frame, text="(勾选后读取文件夹及其所有子文件夹中的图片)", 
-                                           foreground="gray", font=("Arial", 9))
-        self.recursive_hint_label.pack(side=tk.LEFT)
+        self.recursive_hint_label = self._create_hint_label("(勾选后读取文件夹及其所有子文件夹中的图片)", row=1)
     
     def _create_resolution_filter_options(self):
-        """创建分辨率过滤选项"""
-        filter_frame = ttk.Frame(self.file_frame)
-        filter_frame.grid(row=2, column=0, columnspan=6, sticky=(tk.W, tk.E), pady=(2, 2))
-        
+        """创建分辨率过滤选项（数值输入框在首次启用过滤时才创建）"""
         self.resolution_filter_var = tk.BooleanVar(value=False)
-        filter_check = ttk.Checkbutton(filter_frame, text="启用分辨率过滤", 
+        filter_check = ttk.Checkbutton(self.file_frame, text="启用分辨率过滤", 
                                      variable=self.resolution_filter_var, command=self._on_resolution_filter_change)
-        filter_check.pack(side=tk.LEFT, padx=(0, 10))
+        filter_check.grid(row=2, column=0, sticky=tk.W, padx=(0, 10), pady=(2, 2))
+        
+        # 变量先创建，配置读取与过滤逻辑不依赖输入框是否已构建
+        self.min_width_var = tk.StringVar(value="1920")
+        self.min_height_var = tk.StringVar(value="1080")
+        
+        self.resolution_hint_label = self._create_hint_label("(禁用后将处理所有图片文件)", row=2)
         
-        self.resolution_input_frame = ttk.Frame(filter_frame)
-        self.resolution_input_frame.pack(side=tk.LEFT)
+        self.min_width_var.trace_add('write', self._mark_filters_dirty)
+        self.min_height_var.trace_add('write', self._mark_filters_dirty)
+    
+    def _build_resolution_inputs(self):
+        """创建分辨率数值输入框（只创建一次）"""
+        if self.resolution_input_frame is not None:
+            return
+        self.resolution_input_frame = ttk.Frame(self.file_frame)
         
         ttk.Label(self.resolution_input_frame, text="最小分辨率:").pack(side=tk.LEFT, padx=(0, 5))
         
-        self.min_width_var = tk.StringVar(value="1920")
         width_spinbox = ttk.Spinbox(self.resolution_input_frame, from_=1, to=10000, 
                                    textvariable=self.min_width_var, width=8)
         width_spinbox.pack(side=tk.LEFT, padx=(0, 2))
         
         ttk.Label(self.resolution_input_frame, text="×").pack(side=tk.LEFT, padx=(2, 2))
         
-        self.min_height_var = tk.StringVar(value="1080")
         height_spinbox = ttk.Spinbox(self.resolution_input_frame, from_=1, to=10000, 
                                     textvariable=self.min_height_var, width=8)
         height_spinbox.pack(side=tk.LEFT, padx=(2, 5))
         
         ttk.Label(self.resolution_input_frame, text="像素").pack(side=tk.LEFT)
-        
-        self.resolution_hint_label = ttk.Label(filter_frame, text="(启用后只处理等于或高于指定分辨率的图片)", 
-                                             foreground="gray", font=("Arial", 9))
-        self.resolution_hint_label.pack(side=tk.LEFT, padx=(10, 0))
-        
-        self.min_width_var.trace('w', self._on_resolution_filter_value_change)
-        self.min_height_var.trace('w', self._on_resolution_filter_value_change)
+    
+    def _update_resolution_inputs(self):
+        """根据分辨率过滤开关显示或隐藏数值输入框"""
+        if self.resolution_filter_var.get():
+            self._build_resolution_inputs()
+            self.resolution_input_frame.grid(row=2, column=1, sticky=tk.W, pady=(2, 2))
+            self.resolution_hint_label.config(text="(启用后只处理等于或高于指定分辨率的图片)")
+        else:
+            if self.resolution_input_frame is not None:
+                self.resolution_input_frame.grid_remove()
+            self.resolution_hint_label.config(text="(禁用后将处理所有图片文件)")
     
     def _create_format_filter_options(self):
         """创建格式过滤选项"""
-        format_frame = ttk.Frame(self.file_frame)
-        format_frame.grid(row=3, column=0, columnspan=6, sticky=(tk.W, tk.E), pady=(2, 2))
-
-        ttk.Label(format_frame, text="图片格式:").pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Label(self.file_frame, text="图片格式:").grid(row=3, column=0, sticky=tk.W, padx=(0, 10), pady=(2, 2))
 
-        self.format_filter_var = tk.StringVar(value="全部格式")
-        format_combo = ttk.Combobox(format_frame, textvariable=self.format_filter_var,
-                                   values=["全部格式", "仅JPEG", "仅PNG", "仅BMP", "仅GIF", "仅TIFF", "仅WEBP"],
+        self.format_filter_var = tk.StringVar(value=_DEFAULT_FORMAT_OPTION)
+        format_combo = ttk.Combobox(self.file_frame, textvariable=self.format_filter_var,
+                                   values=_FORMAT_OPTIONS,
                                    width=12, state="readonly")
-        format_combo.pack(side=tk.LEFT, padx=(0, 10))
+        format_combo.grid(row=3, column=1, sticky=tk.W, pady=(2, 2))
 
-        self.format_hint_label = ttk.Label(format_frame, text="(选择要读取的图片格式类型)",
-                                         foreground="gray", font=("Arial", 9))
-        self.format_hint_label.pack(side=tk.LEFT, padx=(10, 0))
+        self.format_hint_label = self._create_hint_label("(选择要读取的图片格式类型)", row=3)
 
-        self.format_filter_var.trace('w', self._on_format_filter_change)
+        self.format_filter_var.trace_add('write', self._mark_filters_dirty)
     
     def _create_sort_options(self):
         """创建排序选项"""
-        sort_frame = ttk.Frame(self.file_frame)
-        sort_frame.grid(row=4, column=0, columnspan=6, sticky=(tk.W, tk.E), pady=(2, 2))
-
-        ttk.Label(sort_frame, text="文件排序:").pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Label(self.file_frame, text="文件排序:").grid(row=4, column=0, sticky=tk.W, padx=(0, 10), pady=(2, 2))
 
-        self.sort_option_var = tk.StringVar(value="file_size_desc")
-        sort_combo = ttk.Combobox(sort_frame, textvariable=self.sort_option_var,
-                                 values=["按文件大小(大到小)", "按文件大小(小到大)",
-                                        "按分辨率宽度(大到小)", "按分辨率宽度(小到大)",
-                                        "按分辨率高度(大到小)", "按分辨率高度(小到大)",
-                                        "按文件名(A-Z)", "按文件名(Z-A)"],
+        self.sort_option_var = tk.StringVar(value=_DEFAULT_SORT_OPTION)
+        sort_combo = ttk.Combobox(self.file_frame, textvariable=self.sort_option_var,
+                                 values=_SORT_OPTIONS,
                                  width=18, state="readonly")
-        sort_combo.pack(side=tk.LEFT, padx=(0, 10))
+        sort_combo.grid(row=4, column=1, sticky=tk.W, pady=(2, 2))
 
-        self.sort_hint_label = ttk.Label(sort_frame, text="(选择文件列表排序方式)",
-                                       foreground="gray", font=("Arial", 9))
-        self.sort_hint_label.pack(side=tk.LEFT, padx=(10, 0))
+        self.sort_hint_label = self._create_hint_label("(选择文件列表排序方式)", row=4)
 
-        self.sort_option_var.trace('w', self._on_sort_option_change)
+        self.sort_option_var.trace_add('write', self._mark_filters_dirty)
+    
+    def _create_file_list(self):
+        """创建文件列表（虚拟列表：只插入可见的若干行，滚动时替换内容）"""
+        list_frame = ttk.Frame(self.file_frame)
+        list_frame.grid(row=5, column=0, columnspan=8, sticky=(tk.W, tk.E), pady=(2, 2))
+        
+        self.file_tree = ttk.Treeview(list_frame, columns=("name", "size"), show="headings",
+                                      height=_FILE_LIST_ROWS, selectmode="browse")
+        self.file_tree.heading("name", text="文件名")
+        self.file_tree.heading("size", text="大小")
+        self.file_tree.column("name", anchor=tk.W)
+        self.file_tree.column("size", width=90, anchor=tk.E, stretch=False)
+        self.file_tree.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        # 滚动条不与 Treeview 直接关联，由 _render_file_list 按文件总数设置位置
+        self.file_list_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self._on_file_list_scroll)
+        self.file_list_scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+        self.file_list_scrollbar.set(0, 1)
+        
+        self.file_tree.bind('<<TreeviewSelect>>', self._on_file_list_select)
+        self.file_tree.bind('<MouseWheel>', self._on_file_list_wheel)
+        self.file_tree.bind('<Button-4>', self._on_file_list_wheel)
+        self.file_tree.bind('<Button-5>', self._on_file_list_wheel)
+    
+    def _render_file_list(self, start: int):
+        """从 start 开始显示一屏文件"""
+        count = self.file_manager.get_file_count()
+        start = max(0, min(start, count - _FILE_LIST_ROWS))
+        end = min(start + _FILE_LIST_ROWS, count)
+        self._visible_range = (start, end)
+        
+        self.file_tree.delete(*self.file_tree.get_children())
+        for index, path in enumerate(self.file_manager.get_files_slice(start, end), start):
+            try:
+                size_text = format_file_size(self.file_manager.get_file_size(path))
+            except OSError:
+                size_text = ""
+            self.file_tree.insert('', 'end', iid=str(index), values=(os.path.basename(path), size_text))
+        
+        current_index = self.file_manager.get_current_index()
+        if start <= current_index < end:
+            self.file_tree.selection_set(str(current_index))
+        
+        if count:
+            self.file_list_scrollbar.set(start / count, end / count)
+        else:
+            self.file_list_scrollbar.set(0, 1)
+    
+    def _refresh_file_list(self):
+        """刷新文件列表，当前文件不在可见范围内时滚动到当前文件"""
+        start, end = self._visible_range
+        current_index = self.file_manager.get_current_index()
+        if not start <= current_index < end:
+            start = current_index - _FILE_LIST_ROWS // 2
+        self._render_file_list(start)
+    
+    def _on_file_list_scroll(self, action: str, amount: str, unit: str = None):
+        """滚动条拖动/点击"""
+        if self._scanning:
+            return
+        start = self._visible_range[0]
+        if action == tk.MOVETO:
+            start = int(float(amount) * self.file_manager.get_file_count())
+        elif unit == tk.PAGES:
+            start += int(amount) * _FILE_LIST_ROWS
+        else:
+            start += int(amount)
+        self._render_file_list(start)
+    
+    def _on_file_list_wheel(self, event):
+        """鼠标滚轮滚动文件列表"""
+        if self._scanning:
+            return "break"
+        if event.num == 4 or event.delta > 0:
+            step = -3
+        else:
+            step = 3
+        self._render_file_list(self._visible_range[0] + step)
+        return "break"
+    
+    def _on_file_list_select(self, event):
+        """在文件列表中选择文件"""
+        if self._scanning:
+            return
+        selection = self.file_tree.selection()
+        if not selection:
+            return
+        index = int(selection[0])
+        # 程序设置选中项（导航后刷新列表）时不重复加载
+        if index == self.file_manager.get_current_index():
+            return
+        self.file_manager.set_current_index(index)
+        file_path = self.file_manager.get_current_file()
+        if file_path and self.on_navigation_callback:
+            self.on_navigation_callback(file_path)
     
     def _setup_layout(self):
         """设置组件布局"""
@@ -179,60 +375,102 @@ class FileManagerView:
     
     def _select_single_file(self):
         """选择单个文件"""
-        format_filter = self._get_format_filter_config()
-        if format_filter:
-            format_patterns = [f"*{ext}" for ext in format_filter]
-            filter_name = self.format_filter_var.get().replace("仅", "")
-            filetypes = [(f"{filter_name}文件", " ".join(format_patterns)), ("所有文件", "*.*")]
-        else:
-            filetypes = [("所有文件", "*.*"), ("图片文件", "*.jpg *.jpeg *.png *.bmp *.gif *.tiff *.webp")]
-
+        if not self.on_file_selected_callback:
+            return
+        
+        filetypes = _FILETYPES_BY_FORMAT.get(self.format_filter_var.get(), _FILETYPES_BY_FORMAT[_DEFAULT_FORMAT_OPTION])
         file_path = filedialog.askopenfilename(title="选择图片文件", filetypes=filetypes)
-        if file_path and self.on_file_selected_callback:
+        if file_path:
             self.on_file_selected_callback(file_path, is_single=True)
     
     def _select_directory(self):
-        """选择文件夹"""
+        """选择文件夹，在后台线程中扫描和排序"""
         directory_path = filedialog.askdirectory(title="选择包含图片的文件夹")
-        if directory_path:
-            if self.asset_cleaner_panel:
-                self.asset_cleaner_panel.set_project_directory(directory_path)
-
-            files = self.file_manager.select_directory_with_filter_and_sort(
-                directory_path, self.recursive_var.get(), 
-                self._get_resolution_filter_config(), 
-                self._get_sort_config(), 
-                self._get_format_filter_config()
-            )
-            
-            if files and self.on_file_selected_callback:
+        if not directory_path:
+            return
+        if self.asset_cleaner_panel:
+            self.asset_cleaner_panel.set_project_directory(directory_path)
+        
+        filters = self.get_current_filters()
+        self.scan_directory(directory_path, filters, lambda files: self._on_directory_scanned(files, filters))
+    
+    def scan_directory(self, directory_path: str, filters: Dict[str, Any],
+                       on_complete: Callable[[List[str]], None]):
+        """
+        在后台线程中按过滤条件扫描目录（选择文件夹、过滤变化和同步目录都经过这里）
+        
+        后台线程只生成文件列表，FileManager 的当前目录和文件列表在主线程应用扫描结果时一次性替换。
+        扫描期间禁用文件选择和导航、不响应文件列表操作；完成后在主线程调用 on_complete(files)。
+        扫描期间又提交了新的扫描时，本次结果直接丢弃，不会写入 FileManager。
+        
+        Args:
+            directory_path: 目录路径
+            filters: get_current_filters 返回的过滤配置（在主线程读取，后台线程不访问 Tk 变量）
+            on_complete: 扫描完成回调，参数为过滤和排序后的文件列表
+        """
+        self._scan_generation += 1
+        generation = self._scan_generation
+        self._last_applied_filters = self._filters_signature(directory_path, filters)
+        self._scanning = True
+        self.set_enabled(False)
+        self._set_file_count_text("扫描中...")
+        if self.on_scan_started_callback:
+            self.on_scan_started_callback()
+        
+        future = self._scan_pool.submit(
+            self.file_manager.scan_directory_with_filter_and_sort,
+            directory_path, filters['recursive'],
+            filters['resolution'], filters['sort'], filters['format']
+        )
+        future.add_done_callback(
+            lambda f: self.parent.after(0, self._on_scan_complete, generation, directory_path, f, on_complete))
+    
+    def _on_scan_complete(self, generation: int, directory_path: str, future: Future,
+                          on_complete: Callable[[List[str]], None]):
+        """目录扫描完成（主线程）"""
+        if generation != self._scan_generation:
+            # 已有更新的扫描在排队，本次结果已过期
+            return
+        self._scanning = False
+        self.set_enabled(True)
+        try:
+            files = future.result()
+        except Exception as e:
+            logger.error(f"扫描文件夹失败: {e}")
+            files = []
+        
+        # 计数和文件列表由 FileManager 的索引变化回调刷新
+        self.file_manager.set_directory_files(directory_path, files)
+        on_complete(files)
+    
+    def _on_directory_scanned(self, files: List[str], filters: Dict[str, Any]):
+        """选择文件夹的扫描完成"""
+        if files:
+            if self.on_file_selected_callback:
+                # 回调携带完整文件列表，导航按钮和计数由回调方统一刷新
                 self.on_file_selected_callback(files[0], is_single=False, all_files=files)
-                self.update_navigation_buttons()
-                self.update_file_count_label()
-            elif not files:
-                resolution_filter = self._get_resolution_filter_config()
-                format_filter = self._get_format_filter_config()
-                error_parts = ["所选文件夹中没有找到支持的图片文件"]
-                if resolution_filter['enabled']:
-                    error_parts.append(f"(分辨率要求≥{resolution_filter['min_width']}×{resolution_filter['min_height']})")
-                if format_filter:
-                    format_name = self.format_filter_var.get().replace("仅", "")
-                    error_parts.append(f"(格式要求: {format_name})")
-                messagebox.showwarning("无图片文件", " ".join(error_parts))
+            return
+        
+        resolution_filter = filters['resolution']
+        error_parts = ["所选文件夹中没有找到支持的图片文件"]
+        if resolution_filter['enabled']:
+            error_parts.append(f"(分辨率要求≥{resolution_filter['min_width']}×{resolution_filter['min_height']})")
+        if filters['format']:
+            format_name = self.format_filter_var.get().replace("仅", "")
+            error_parts.append(f"(格式要求: {format_name})")
+        messagebox.showwarning("无图片文件", " ".join(error_parts))
     
     def _show_previous_image(self):
         """显示上一张图片"""
         prev_file = self.file_manager.get_previous_file()
         if prev_file and self.on_navigation_callback:
             self.on_navigation_callback(prev_file)
-            self.update_file_count_label()
     
     def _show_next_image(self):
         """显示下一张图片"""
         next_file = self.file_manager.get_next_file()
         if next_file and self.on_navigation_callback:
             self.on_navigation_callback(next_file)
-            self.update_file_count_label()
     
     def _on_recursive_change(self):
         """处理递归选项变更"""
@@ -240,64 +478,73 @@ class FileManagerView:
             self.recursive_hint_label.config(text="(勾选后读取文件夹及其所有子文件夹中的图片)")
         else:
             self.recursive_hint_label.config(text="(取消勾选后只读取当前文件夹中的图片)")
-        if self.file_manager.current_directory and self.on_filter_changed_callback:
-            self.on_filter_changed_callback()
+        self._notify_filter_changed()
     
     def _on_resolution_filter_change(self):
         """处理分辨率过滤选项变更"""
-        if self.resolution_filter_var.get():
-            self.resolution_input_frame.pack(side=tk.LEFT)
-            self.resolution_hint_label.config(text="(启用后只处理等于或高于指定分辨率的图片)")
-        else:
-            self.resolution_input_frame.pack_forget()
-            self.resolution_hint_label.config(text="(禁用后将处理所有图片文件)")
+        self._update_resolution_inputs()
         self._save_resolution_filter_config()
-        if self.file_manager.current_directory and self.on_filter_changed_callback:
-            self.on_filter_changed_callback()
+        self._notify_filter_changed()
     
-    def _on_resolution_filter_value_change(self, *args):
-        """处理分辨率过滤数值变化"""
-        self._save_resolution_filter_config()
-        if self.file_manager.current_directory and self.on_filter_changed_callback:
-            self.on_filter_changed_callback()
+    def _mark_filters_dirty(self, *args):
+        """分辨率数值、格式或排序变化：标记待应用并延迟处理，防抖期内的多次变化合并为一次"""
+        self._filters_dirty = True
+        if self._filter_debounce_id:
+            self.parent.after_cancel(self._filter_debounce_id)
+        self._filter_debounce_id = self.parent.after(_FILTER_DEBOUNCE_MS, self._apply_filter_change)
     
-    def _on_format_filter_change(self, *args):
-        """处理图片格式筛选变化"""
+    def _apply_filter_change(self):
+        """保存过滤配置并通知重新扫描"""
+        self._filter_debounce_id = None
+        if not self._filters_dirty:
+            return
+        self._filters_dirty = False
+        self._save_resolution_filter_config()
         self._save_format_filter_config()
-        if self.file_manager.current_directory and self.on_filter_changed_callback:
-            self.on_filter_changed_callback()
-    
-    def _on_sort_option_change(self, *args):
-        """处理排序选项变化"""
         self._save_sort_config()
-        if self.file_manager.current_directory and self.on_filter_changed_callback:
-            self.on_filter_changed_callback()
+        self._notify_filter_changed()
+    
+    def _notify_filter_changed(self):
+        """通知过滤选项已变化（无回调、未选择目录、分辨率输入未完成或条件未变时直接跳过）"""
+        if not (self.on_filter_changed_callback and self.file_manager.current_directory):
+            return
+        filters = self.get_current_filters()
+        # 分辨率输入尚未填完整（为0）时不重新扫描，等用户输入完成
+        resolution_filter = filters['resolution']
+        if resolution_filter['enabled'] and not (resolution_filter['min_width'] and resolution_filter['min_height']):
+            return
+        # 与上次扫描使用的过滤条件相同（如勾选后又取消）时不重复扫描
+        signature = self._filters_signature(self.file_manager.current_directory, filters)
+        if signature == self._last_applied_filters:
+            return
+        self._last_applied_filters = signature
+        self.on_filter_changed_callback()
+    
+    @staticmethod
+    def _filters_signature(directory: str, filters: Dict[str, Any]) -> str:
+        """将目录和过滤配置序列化为可比较的字符串"""
+        # 格式筛选为 frozenset，序列化时转为有序列表
+        return json.dumps([directory, filters], sort_keys=True, default=sorted)
     
     def _get_resolution_filter_config(self) -> Dict[str, Any]:
         """获取分辨率过滤配置"""
         return {
             'enabled': self.resolution_filter_var.get(),
-            'min_width': int(self.min_width_var.get()),
-            'min_height': int(self.min_height_var.get())
+            'min_width': _safe_int(self.min_width_var.get(), 0),
+            'min_height': _safe_int(self.min_height_var.get(), 0)
         }
     
-    def _get_format_filter_config(self) -> Optional[List[str]]:
-        """获取图片格式筛选配置"""
-        format_map = {
-            "全部格式": None, "仅JPEG": ['.jpg', '.jpeg'], "仅PNG": ['.png'],
-            "仅BMP": ['.bmp'], "仅GIF": ['.gif'], "仅TIFF": ['.tiff'], "仅WEBP": ['.webp']
-        }
-        return format_map.get(self.format_filter_var.get(), None)
+    def _get_format_filter_config(self) -> Optional[FrozenSet[str]]:
+        """获取图片格式筛选配置
+
+        Returns:
+            小写扩展名的 frozenset（如 {'.jpg', '.jpeg'}），None 表示不筛选
+        """
+        return _FORMAT_MAP.get(self.format_filter_var.get())
     
     def _get_sort_config(self) -> str:
         """获取排序配置"""
-        sort_option_map = {
-            "按文件大小(大到小)": "file_size_desc", "按文件大小(小到大)": "file_size_asc",
-            "按分辨率宽度(大到小)": "width_desc", "按分辨率宽度(小到大)": "width_asc",
-            "按分辨率高度(大到小)": "height_desc", "按分辨率高度(小到大)": "height_asc",
-            "按文件名(A-Z)": "filename_asc", "按文件名(Z-A)": "filename_desc"
-        }
-        return sort_option_map.get(self.sort_option_var.get(), "file_size_desc")
+        return _SORT_OPTION_MAP.get(self.sort_option_var.get(), _DEFAULT_SORT_CONFIG)
     
     def _save_resolution_filter_config(self):
         """保存分辨率过滤配置"""
@@ -305,25 +552,55 @@ class FileManagerView:
             filter_config = self._get_resolution_filter_config()
             self.config.set_resolution_filter_config(
                 filter_config['enabled'], filter_config['min_width'], filter_config['min_height'])
-            self.config.save_config()
+            self._schedule_save()
         except Exception as e:
-            logger.error(f"保存分辨率过滤配置失败: {e}")
+            self._log_save_error(f"保存分辨率过滤配置失败: {e}")
+    
+    def _log_save_error(self, message: str):
+        """记录保存失败的错误日志（限频，间隔内的重复错误直接丢弃）"""
+        now = time.monotonic()
+        if now - self._last_save_error_time >= _SAVE_ERROR_LOG_INTERVAL:
+            self._last_save_error_time = now
+            logger.error(message)
     
     def _save_format_filter_config(self):
         """保存格式筛选配置"""
         try:
             self.config.set('format_filter', self.format_filter_var.get())
-            self.config.save_config()
+            self._schedule_save()
         except Exception as e:
-            logger.error(f"保存格式筛选配置失败: {e}")
+            self._log_save_error(f"保存格式筛选配置失败: {e}")
     
     def _save_sort_config(self):
         """保存排序配置"""
         try:
             self.config.set_sort_config(self._get_sort_config())
-            self.config.save_config()
+            self._schedule_save()
         except Exception as e:
-            logger.error(f"保存排序配置失败: {e}")
+            self._log_save_error(f"保存排序配置失败: {e}")
+    
+    def _schedule_save(self):
+        """安排延迟写盘，合并短时间内的多次配置修改"""
+        if self._save_after_id is None:
+            self._save_after_id = self.parent.after(_CONFIG_SAVE_DELAY_MS, self._flush_save)
+    
+    def _flush_save(self):
+        """在后台线程中写入配置文件，避免磁盘 I/O 阻塞界面"""
+        self._save_after_id = None
+        self._save_pool.submit(self.config.save_config)
+    
+    def _on_destroy(self, event):
+        """组件销毁时同步写入待保存的配置，停止目录扫描线程，并解除 FileManager 的回调"""
+        self._scan_pool.shutdown(wait=False, cancel_futures=True)
+        # FileManager 可能比视图存活更久，不再回调已销毁的组件
+        if self.file_manager.on_index_changed == self._on_index_changed:
+            self.file_manager.on_index_changed = None
+        if self._save_after_id is not None:
+            self.parent.after_cancel(self._save_after_id)
+            self._save_after_id = None
+            self.config.save_config()
+        # 已提交的写盘任务仍会完成
+        self._save_pool.shutdown(wait=False)
     
     def load_configurations(self):
         """加载所有配置"""
@@ -332,18 +609,13 @@ class FileManagerView:
             self.resolution_filter_var.set(filter_config['enabled'])
             self.min_width_var.set(str(filter_config['min_width']))
             self.min_height_var.set(str(filter_config['min_height']))
+            self._update_resolution_inputs()
             
-            format_config = self.config.get('format_filter', '全部格式')
-            self.format_filter_var.set(format_config)
+            format_config = self.config.get('format_filter', _DEFAULT_FORMAT_OPTION)
+            self.format_filter_var.set(format_config if format_config in _FORMAT_MAP else _DEFAULT_FORMAT_OPTION)
             
             sort_config = self.config.get_sort_config()
-            sort_option_map = {
-                "file_size_desc": "按文件大小(大到小)", "file_size_asc": "按文件大小(小到大)", 
-                "width_desc": "按分辨率宽度(大到小)", "width_asc": "按分辨率宽度(小到大)",
-                "height_desc": "按分辨率高度(大到小)", "height_asc": "按分辨率高度(小到大)",
-                "filename_asc": "按文件名(A-Z)", "filename_desc": "按文件名(Z-A)"
-            }
-            self.sort_option_var.set(sort_option_map.get(sort_config, "按文件大小(大到小)"))
+            self.sort_option_var.set(_SORT_OPTION_REVERSE.get(sort_config, _DEFAULT_SORT_OPTION))
         except Exception as e:
             logger.error(f"加载配置失败: {e}")
     
@@ -357,11 +629,32 @@ class FileManagerView:
             self.prev_btn.config(state=tk.DISABLED)
             self.next_btn.config(state=tk.DISABLED)
     
+    def set_enabled(self, enabled: bool):
+        """启用/禁用文件选择和导航组件"""
+        state = tk.NORMAL if enabled else tk.DISABLED
+        for widget in (self.file_path_entry, self.select_file_btn, self.select_folder_btn):
+            widget.config(state=state)
+        if enabled:
+            # 导航按钮是否可用取决于文件数量
+            self.update_navigation_buttons()
+        else:
+            self.prev_btn.config(state=tk.DISABLED)
+            self.next_btn.config(state=tk.DISABLED)
+    
     def update_file_count_label(self):
         """更新文件计数标签"""
-        current_index = self.file_manager.get_current_index()
-        total_count = self.file_manager.get_file_count()
-        self.file_count_label.config(text=f"{current_index + 1}/{total_count}")
+        self._on_index_changed(self.file_manager.get_current_index(), self.file_manager.get_file_count())
+    
+    def _on_index_changed(self, index: int, count: int):
+        """FileManager 索引变化回调：刷新计数和文件列表（扫描结果也在主线程应用，回调总在主线程触发）"""
+        self._set_file_count_text(f"{index + 1}/{count}" if count else "0/0")
+        self._refresh_file_list()
+    
+    def _set_file_count_text(self, text: str):
+        """设置计数标签文本（所有写入都经过这里，文本未变化时不再写入 Tk 变量）"""
+        if text != self._file_count_text:
+            self._file_count_text = text
+            self.file_count_var.set(text)
     
     def set_file_path(self, path: str):
         """设置文件路径显示"""
@@ -372,11 +665,13 @@ class FileManagerView:
         return self.file_path_var.get()
     
     def set_callbacks(self, on_file_selected: Callable = None, 
-                     on_navigation: Callable = None, on_filter_changed: Callable = None):
+                     on_navigation: Callable = None, on_filter_changed: Callable = None,
+                     on_scan_started: Callable = None):
         """设置回调函数"""
         self.on_file_selected_callback = on_file_selected
         self.on_navigation_callback = on_navigation
         self.on_filter_changed_callback = on_filter_changed
+        self.on_scan_started_callback = on_scan_started
     
     def get_current_filters(self) -> Dict[str, Any]:
         """获取当前所有过滤配置"""
@@ -4,13 +4,12 @@ Acts as a coordinator for all UI managers
 """
 
 import tkinter as tk
-from tkinter import ttk
-from typing import Optional
+from tkinter import ttk, messagebox
 
 from architecture.interfaces import IUIComponent
 from architecture.events import EventBus
-from architecture.di import inject
 from core.config import Config
+from core.file_manager import FileManager
 from gui.managers.preview_manager import PreviewManager
 from gui.managers.process_control_manager import ProcessControlManager
 from gui.managers.file_manager_view import FileManagerView
@@ -20,13 +19,13 @@ from gui.managers.status_bar_manager import StatusBarManager
 class MainView(IUIComponent):
     """Main view of the application, coordinating all UI components"""
     
-    def __init__(self, root: tk.Tk, config: Config, event_bus: EventBus):
+    def __init__(self, root: tk.Tk, config: Config, event_bus: EventBus, file_manager: FileManager):
         self.root = root
         self.config = config
         self._event_bus = event_bus
         
-        # UI Managers
-        self.file_manager_view = FileManagerView(config)
+        # UI Managers (only hold references here; widgets are built in initialize)
+        self.file_manager_view = FileManagerView(config, file_manager)
         self.preview_manager = PreviewManager(config)
         self.process_control_manager = ProcessControlManager(config)
         self.status_bar_manager = StatusBarManager(config)
@@ -83,8 +82,6 @@ class MainView(IUIComponent):
         
     def on_close(self):
         """Handle window close event"""
-        from tkinter import messagebox
-        
         if self.process_control_manager.is_processing:
             if messagebox.askokcancel("退出", "正在处理图片，确定要退出吗？"):
                 # Stop processing before closing
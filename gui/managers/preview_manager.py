@@ -6,33 +6,107 @@
 import tkinter as tk
 from tkinter import ttk
 from PIL import Image, ImageTk
+import functools
 import os
-from typing import Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, List, Tuple
 from utils.logger import get_logger
-from utils.common_utils import get_image_info_text
+from utils.common_utils import format_image_info_text
 
 logger = get_logger(__name__)
 
+# 缓存的 PhotoImage 数量上限（PhotoImage 占用 Tk 内存，只保留最近浏览的几张）
+_PHOTO_CACHE_SIZE = 8
+
+# 同时进行的预加载任务数上限
+_MAX_PREFETCH_IN_FLIGHT = 2
+
+# 预览缩放使用的重采样滤镜。JPEG 经 draft 缩小解码后已有抗锯齿效果，BICUBIC 足够且比 LANCZOS 快
+_PREVIEW_RESAMPLE = Image.Resampling.BICUBIC
+
+
+@functools.lru_cache(maxsize=16)
+def _load_thumbnail(image_path: str, mtime_ns: int, max_size: Tuple[int, int],
+                    resample: Image.Resampling = _PREVIEW_RESAMPLE) -> Tuple[Image.Image, Tuple[int, int]]:
+    """
+    解码并缩放图片，结果按 (路径, 修改时间, 尺寸) 缓存
+    
+    Args:
+        image_path: 图像文件路径
+        mtime_ns: 文件修改时间（纳秒），文件变化后缓存自动失效
+        max_size: 缩略图最大尺寸 (max_width, max_height)
+        resample: 重采样滤镜
+        
+    Returns:
+        tuple: (缩放后的图像, 原图尺寸)，图像由缓存共享，调用方不得原地修改
+    """
+    with Image.open(image_path) as pil_image:
+        # draft 会改变 size，先记录原图尺寸
+        original_size = pil_image.size
+        # JPEG 直接按 1/2、1/4、1/8 缩小解码，不必先解码出全尺寸图像（其他格式忽略）
+        pil_image.draft(pil_image.mode, max_size)
+        pil_image.thumbnail(max_size, resample)
+        # 在文件关闭前确保像素数据已载入
+        pil_image.load()
+        # 在后台线程中转换为 Tk 可直接使用的模式，PhotoImage 创建/粘贴时无需再转换（调色板、CMYK、16位等）
+        if pil_image.mode not in ('L', 'RGB', 'RGBA'):
+            has_alpha = 'A' in pil_image.getbands() or 'transparency' in pil_image.info
+            return pil_image.convert('RGBA' if has_alpha else 'RGB'), original_size
+        return pil_image, original_size
+
+
+def _photo_mode(image: Image.Image) -> str:
+    """PhotoImage 为该图像使用的像素模式（与 ImageTk.PhotoImage 的选择规则一致）"""
+    mode = image.mode
+    if mode == "P":
+        mode = image.palette.mode if image.palette else "RGB"
+    if mode in ("1", "L", "RGB", "RGBA"):
+        return mode
+    return Image.getmodebase(mode)
+
 
 class PreviewManager:
     """图像预览管理器类"""
     
-    def __init__(self, parent: tk.Widget, config, processor):
+    def __init__(self, parent: tk.Widget, config):
         """
         初始化预览管理器
         
         Args:
             parent: 父窗口组件
             config: 配置管理器
-            processor: 图像处理器实例
         """
         self.parent = parent
         self.config = config
-        self.processor = processor
         
-        # 图像引用（防止垃圾回收）
-        self.current_image_tk = None
-        self.processed_image_tk = None
+        # 每个预览区域当前显示的 PhotoImage（保持引用防止垃圾回收）
+        self._shown_photos = {True: None, False: None}
+        
+        # 最近一次显示使用的缩略图尺寸（预加载使用相同尺寸才能命中缓存）
+        self._last_thumbnail_size = None
+        # PhotoImage 缓存：(路径, 修改时间, 尺寸) -> PhotoImage 等，保持强引用防止被回收
+        # 值为 (PhotoImage, 信息文本, PhotoImage 像素模式)
+        self._photo_cache: "OrderedDict[Tuple[str, int, Tuple[int, int]], Tuple[ImageTk.PhotoImage, str, str]]" = OrderedDict()
+        # 从缓存淘汰且未在显示中的 PhotoImage，尺寸和模式相同时用 paste 复用，避免重新分配 Tk 图像
+        self._spare_photo: Optional[Tuple[ImageTk.PhotoImage, Tuple[int, int], str]] = None
+        # 配置的预览最大尺寸（只在初始化和 refresh_preview_size 时读取配置）
+        self._preview_size = self.config.get_preview_size()
+        
+        # 图片解码和缩放在线程池中执行，PhotoImage 在主线程中创建
+        self._decode_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="preview-decode")
+        # 每个预览区域最近一次显示请求的编号，用于丢弃过期的解码结果
+        self._request_ids = {True: 0, False: 0}
+        # 限制同时进行的预加载数量，避免占满磁盘和解码线程
+        self._prefetch_slots = threading.BoundedSemaphore(_MAX_PREFETCH_IN_FLIGHT)
+        # 每个预览区域当前显示的图片 (路径, 修改时间, 尺寸)，相同则无需重新显示
+        self._shown_keys = {True: None, False: None}
+        # 每个预览区域正在后台解码的图片，重复请求同一图片时等待已有任务，不重新解码
+        self._pending_keys = {True: None, False: None}
+        
+        # 预览标签尺寸（由 <Configure> 事件更新），避免每次显示都强制同步布局
+        self._label_sizes = {True: None, False: None}
         
         # 组件
         self.preview_frame = None
@@ -40,6 +114,10 @@ class PreviewManager:
         self.processed_label = None
         self.original_resolution_label = None
         self.processed_resolution_label = None
+        # 每个预览区域的 (图片标签, 信息标签, 占位文本)，原图和处理后共用同一套显示/清空逻辑
+        self._slots = {}
+        # 信息标签当前文本，未变化时不再调用 configure（每次调用都是一次 Tcl 往返）
+        self._info_texts = {True: "", False: ""}
         
         self._create_widgets()
         self._setup_layout()
@@ -52,110 +130,225 @@ class PreviewManager:
         preview_container = ttk.Frame(self.preview_frame)
         
         # 原图预览
-        original_frame = ttk.LabelFrame(preview_container, text="原图", padding="5")
-        self.original_label = ttk.Label(
-            original_frame, 
-            text="请选择图片文件",
-            relief=tk.SUNKEN,
-            anchor=tk.CENTER
-        )
-        self.original_label.pack(fill=tk.BOTH, expand=True)
+        self.original_label, self.original_resolution_label = self._create_preview_slot(
+            preview_container, "原图", "请选择图片文件", True, side=tk.LEFT, padx=(0, 5))
         
-        self.original_resolution_label = ttk.Label(
-            original_frame,
-            text="",
-            foreground="gray",
-            font=("Arial", 9)
-        )
-        self.original_resolution_label.pack(pady=(2, 0))
+        # 处理后预览
+        self.processed_label, self.processed_resolution_label = self._create_preview_slot(
+            preview_container, "处理后", "等待处理", False, side=tk.RIGHT, padx=(5, 0))
         
-        original_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
+        preview_container.pack(fill=tk.BOTH, expand=True)
+        preview_container.columnconfigure(0, weight=1)
+        preview_container.columnconfigure(1, weight=1)
         
-        # 处理后预览
-        processed_frame = ttk.LabelFrame(preview_container, text="处理后", padding="5")
-        self.processed_label = ttk.Label(
-            processed_frame,
-            text="等待处理",
+        # 窗口关闭时停止解码线程
+        self.preview_frame.bind('<Destroy>', self._on_destroy)
+    
+    def _create_preview_slot(self, container: ttk.Frame, title: str, placeholder: str,
+                             is_original: bool, side: str, padx: Tuple[int, int]) -> Tuple[ttk.Label, ttk.Label]:
+        """
+        创建一个预览区域（图片标签和信息标签）并登记到 _slots
+        
+        Returns:
+            tuple: (图片标签, 信息标签)
+        """
+        frame = ttk.LabelFrame(container, text=title, padding="5")
+        label = ttk.Label(
+            frame,
+            text=placeholder,
             relief=tk.SUNKEN,
             anchor=tk.CENTER
         )
-        self.processed_label.pack(fill=tk.BOTH, expand=True)
+        label.pack(fill=tk.BOTH, expand=True)
+        label.bind('<Configure>', lambda e: self._on_label_configure(is_original, e))
         
-        self.processed_resolution_label = ttk.Label(
-            processed_frame,
+        info_label = ttk.Label(
+            frame,
             text="",
             foreground="gray",
             font=("Arial", 9)
         )
-        self.processed_resolution_label.pack(pady=(2, 0))
+        info_label.pack(pady=(2, 0))
         
-        processed_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(5, 0))
+        frame.pack(side=side, fill=tk.BOTH, expand=True, padx=padx)
         
-        preview_container.pack(fill=tk.BOTH, expand=True)
-        preview_container.columnconfigure(0, weight=1)
-        preview_container.columnconfigure(1, weight=1)
+        self._slots[is_original] = (label, info_label, placeholder)
+        return label, info_label
+    
+    def _on_label_configure(self, is_original: bool, event):
+        """记录预览标签的新尺寸"""
+        self._label_sizes[is_original] = (event.width, event.height)
+    
+    def _on_destroy(self, event):
+        """组件销毁时丢弃尚未开始的解码任务"""
+        self._decode_pool.shutdown(wait=False, cancel_futures=True)
     
     def _setup_layout(self):
         """设置组件布局"""
         # 布局在 _create_widgets 中完成
         pass
     
-    def display_image(self, image_path: str, label_widget: ttk.Label, is_original: bool = True):
+    def display_image(self, image_path: str, label_widget: ttk.Label, is_original: bool = True,
+                      image_stat: Optional[os.stat_result] = None):
         """
-        在指定标签中显示图片
+        在指定标签中显示图片（解码在后台线程进行，完成后回到主线程显示）
         
         Args:
             image_path: 图像文件路径
             label_widget: 显示图像的标签组件
             is_original: 是否是原图
+            image_stat: 调用方已取得的文件 stat 结果，提供时不再重复 stat
         """
         try:
-            # 打开图片
-            pil_image = Image.open(image_path)
-            
-            # 获取标签大小
-            label_widget.update_idletasks()
-            label_width = label_widget.winfo_width()
-            label_height = label_widget.winfo_height()
+            # 获取标签大小（尚未收到 <Configure> 时读取当前尺寸，不强制布局）
+            label_size = self._label_sizes[is_original]
+            if label_size is None:
+                label_size = (label_widget.winfo_width(), label_widget.winfo_height())
+            label_width, label_height = label_size
             
             # 计算缩放比例
-            max_width, max_height = self.config.get_preview_size()
+            max_width, max_height = self._preview_size
             if label_width > 1 and label_height > 1:
                 max_width = min(max_width, label_width - 10)
                 max_height = min(max_height, label_height - 10)
+            self._last_thumbnail_size = (max_width, max_height)
             
-            # 调整图片大小
-            pil_image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
-            
-            # 转换为Tkinter格式
-            tk_image = ImageTk.PhotoImage(pil_image)
-            
-            # 显示图片
-            label_widget.config(image=tk_image, text="")
-            
-            # 保存引用防止被垃圾回收
-            if is_original:
-                self.current_image_tk = tk_image
-            else:
-                self.processed_image_tk = tk_image
-            
-            # 更新图片信息显示
-            info_text = get_image_info_text(self.processor, image_path)
-            if is_original:
-                self.original_resolution_label.config(text=info_text)
-            else:
-                self.processed_resolution_label.config(text=info_text)
-                
-            logger.debug(f"成功显示图像: {os.path.basename(image_path)}")
-                
+            # 只 stat 一次，修改时间用于缓存键，文件大小用于信息显示
+            if image_stat is None:
+                image_stat = os.stat(image_path)
         except Exception as e:
-            logger.error(f"显示图像失败: {image_path}, 错误: {e}")
-            label_widget.config(image='', text=f"显示错误: {str(e)}")
-            # 清空信息显示
-            if is_original:
-                self.original_resolution_label.config(text="")
-            else:
-                self.processed_resolution_label.config(text="")
+            self._request_ids[is_original] += 1
+            self._pending_keys[is_original] = None
+            self._show_error(image_path, label_widget, is_original, e)
+            return
+        
+        key = (image_path, image_stat.st_mtime_ns, self._last_thumbnail_size)
+        if key == self._pending_keys[is_original]:
+            # 同一图片（文件未变化）的解码已在进行中，等待其结果即可
+            return
+        
+        # 新请求使该区域之前尚未完成的请求失效
+        self._request_ids[is_original] += 1
+        request_id = self._request_ids[is_original]
+        self._pending_keys[is_original] = None
+        
+        if key == self._shown_keys[is_original]:
+            # 文件和显示尺寸都未变化，当前显示的就是要显示的图片
+            return
+        cached = self._photo_cache.get(key)
+        if cached is not None:
+            self._photo_cache.move_to_end(key)
+            self._show_photo(key, label_widget, is_original, cached[0], cached[1])
+            return
+        
+        self._pending_keys[is_original] = key
+        future = self._decode_pool.submit(_load_thumbnail, image_path, image_stat.st_mtime_ns,
+                                          self._last_thumbnail_size)
+        future.add_done_callback(lambda f: self.parent.after(
+            0, self._finish_display, f, key, image_stat, label_widget, is_original, request_id))
+    
+    def refresh_preview_size(self):
+        """重新读取配置中的预览尺寸（配置修改后调用），尺寸变化时清空 PhotoImage 缓存"""
+        preview_size = self.config.get_preview_size()
+        if preview_size != self._preview_size:
+            self._preview_size = preview_size
+            self._photo_cache.clear()
+            self._spare_photo = None
+    
+    def _finish_display(self, future: Future, key: Tuple[str, int, Tuple[int, int]],
+                        image_stat: os.stat_result, label_widget: ttk.Label,
+                        is_original: bool, request_id: int):
+        """后台解码完成（主线程）：创建 PhotoImage 并显示"""
+        if request_id != self._request_ids[is_original]:
+            # 期间已切换到其他图片或已清空
+            return
+        self._pending_keys[is_original] = None
+        
+        image_path = key[0]
+        try:
+            thumbnail, (width, height) = future.result()
+            # 信息文本中的分辨率取自解码时读到的原图尺寸，文件大小取自 stat，不再单独打开文件
+            photo_mode = _photo_mode(thumbnail)
+            cached = (self._make_photo(thumbnail, photo_mode),
+                      format_image_info_text(width, height, image_stat.st_size), photo_mode)
+        except Exception as e:
+            self._show_error(image_path, label_widget, is_original, e)
+            return
+        
+        # 缓存 PhotoImage，来回切换图片时无需重新解码和转换
+        self._photo_cache[key] = cached
+        if len(self._photo_cache) > _PHOTO_CACHE_SIZE:
+            _, (evicted_photo, _, evicted_mode) = self._photo_cache.popitem(last=False)
+            if all(evicted_photo is not photo for photo in self._shown_photos.values()):
+                self._spare_photo = (evicted_photo, (evicted_photo.width(), evicted_photo.height()), evicted_mode)
+        self._show_photo(key, label_widget, is_original, cached[0], cached[1])
+    
+    def _make_photo(self, thumbnail: Image.Image, photo_mode: str) -> ImageTk.PhotoImage:
+        """创建 PhotoImage，有尺寸和模式都相同的备用对象时直接 paste 复用"""
+        spare = self._spare_photo
+        if spare is not None and spare[1] == thumbnail.size and spare[2] == photo_mode:
+            self._spare_photo = None
+            spare[0].paste(thumbnail)
+            return spare[0]
+        return ImageTk.PhotoImage(thumbnail)
+    
+    def _show_photo(self, key: Tuple[str, int, Tuple[int, int]], label_widget: ttk.Label, is_original: bool,
+                    tk_image: ImageTk.PhotoImage, info_text: str):
+        """在标签中显示图片和信息文本"""
+        label_widget.config(image=tk_image, text="")
+        self._shown_keys[is_original] = key
+        
+        # 保存引用防止被垃圾回收，并更新图片信息显示
+        self._shown_photos[is_original] = tk_image
+        self._set_info_text(is_original, info_text)
+        
+        logger.debug("成功显示图像: %s", os.path.basename(key[0]))
+    
+    def _show_error(self, image_path: str, label_widget: ttk.Label, is_original: bool, error: Exception):
+        """显示图片加载错误"""
+        logger.error(f"显示图像失败: {image_path}, 错误: {error}")
+        label_widget.config(image='', text=f"显示错误: {str(error)}")
+        self._shown_keys[is_original] = None
+        self._shown_photos[is_original] = None
+        # 清空信息显示
+        self._set_info_text(is_original, "")
+    
+    def _set_info_text(self, is_original: bool, info_text: str):
+        """更新信息标签文本，与当前文本相同时跳过"""
+        if self._info_texts[is_original] != info_text:
+            self._info_texts[is_original] = info_text
+            self._slots[is_original][1].config(text=info_text)
+    
+    def _get_thumbnail(self, image_path: str, max_size: Tuple[int, int]) -> Tuple[Image.Image, Tuple[int, int]]:
+        """获取缩略图和原图尺寸（带缓存）"""
+        mtime_ns = os.stat(image_path).st_mtime_ns
+        return _load_thumbnail(image_path, mtime_ns, max_size)
+    
+    def prefetch(self, image_paths: List[str]):
+        """
+        在解码线程池中预解码图片，导航到这些图片时可直接命中缓存
+        
+        同时进行的预加载最多 _MAX_PREFETCH_IN_FLIGHT 个，超出时直接跳过，不排队等待。
+        
+        Args:
+            image_paths: 需要预加载的图像文件路径列表
+        """
+        max_size = self._last_thumbnail_size
+        if not image_paths or max_size is None:
+            return
+        
+        for image_path in image_paths:
+            if not self._prefetch_slots.acquire(blocking=False):
+                break
+            future = self._decode_pool.submit(self._prefetch_one, image_path, max_size)
+            future.add_done_callback(lambda f: self._prefetch_slots.release())
+    
+    def _prefetch_one(self, image_path: str, max_size: Tuple[int, int]):
+        """预加载单张图片（在线程池中执行）"""
+        try:
+            self._get_thumbnail(image_path, max_size)
+        except Exception as e:
+            logger.debug("预加载图像失败: %s, 错误: %s", image_path, e)
     
     def display_original(self, image_path: str):
         """
@@ -166,26 +359,33 @@ class PreviewManager:
         """
         self.display_image(image_path, self.original_label, is_original=True)
     
-    def display_processed(self, image_path: str):
+    def display_processed(self, image_path: str, image_stat: Optional[os.stat_result] = None):
         """
         显示处理后的图像
         
         Args:
             image_path: 图像文件路径
+            image_stat: 调用方已取得的文件 stat 结果（可选）
         """
-        self.display_image(image_path, self.processed_label, is_original=False)
+        self.display_image(image_path, self.processed_label, is_original=False, image_stat=image_stat)
+    
+    def _clear_slot(self, is_original: bool):
+        """清空一个预览区域，恢复占位文本"""
+        self._request_ids[is_original] += 1
+        self._pending_keys[is_original] = None
+        self._shown_keys[is_original] = None
+        self._shown_photos[is_original] = None
+        label, _, placeholder = self._slots[is_original]
+        label.config(image='', text=placeholder)
+        self._set_info_text(is_original, "")
     
     def clear_original(self):
         """清空原图预览"""
-        self.original_label.config(image='', text="请选择图片文件")
-        self.original_resolution_label.config(text="")
-        self.current_image_tk = None
+        self._clear_slot(True)
     
     def clear_processed(self):
         """清空处理后预览"""
-        self.processed_label.config(image='', text="等待处理")
-        self.processed_resolution_label.config(text="")
-        self.processed_image_tk = None
+        self._clear_slot(False)
     
     def clear_all(self):
         """清空所有预览"""
@@ -5,13 +5,38 @@
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import threading
-import os
-from typing import Optional, Callable, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Callable, Dict, Any, List, Tuple
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 选项变化后更新提示/按钮状态的合并延迟（毫秒），连续变化只更新一次
+_OPTION_UPDATE_DELAY_MS = 50
+
+# 内置的默认 TinyPNG API 密钥，以及配置文件中未填写密钥时的占位值
+_DEFAULT_TINYPNG_KEY = "4PGdmZhdCHG9NJ53VMl2kTZfcFCFTTNH"
+_TINYPNG_KEY_PLACEHOLDER = "your_tinypng_api_key_here"
+
+# 提示标签样式（字体和默认颜色只配置一次，各提示标签共用）
+_HINT_STYLE = "Hint.TLabel"
+
+# Pillow 压缩质量提示：(质量上限, 颜色, 说明)，按质量从低到高排列
+_QUALITY_BUCKETS = (
+    (10, "red", "极限压缩: 极小文件，严重失真"),
+    (30, "orange", "高压缩: 小文件，明显失真"),
+    (50, "blue", "中等压缩: 较小文件，轻微失真"),
+    (75, "green", "轻度压缩: 轻微减小，质量良好"),
+    (100, "darkgreen", "高质量: 文件较大，质量优秀"),
+)
+_QUALITY_HINT_DEFAULT = ("(1-100, 数值越小压缩率越高)", "gray")
+
+# 是否保持宽高比 -> 提示文本
+_ASPECT_HINTS = {
+    True: "(保持比例，图片可能不完全匹配指定尺寸)",
+    False: "(强制调整，图片将完全匹配指定尺寸，可能变形)",
+}
+
 
 class ProcessControlManager:
     """处理控制管理器类"""
@@ -24,6 +49,8 @@ class ProcessControlManager:
         self.file_manager = file_manager
         
         # 回调函数
+        self.on_process_callback = None
+        self.on_batch_process_callback = None
         self.on_process_complete_callback = None
         self.on_process_error_callback = None
         self.on_batch_progress_callback = None
@@ -31,36 +58,53 @@ class ProcessControlManager:
         
         # UI 组件
         self.control_frame = None
-        self.process_type_var = None
-        self.resize_mode_var = None
-        self.percentage_var = None
-        self.width_var = None
-        self.height_var = None
-        self.maintain_aspect_var = None
-        self.output_mode_var = None
-        self.output_format_var = None
-        self.meta_override_var = None
-        self.tinypng_api_key_var = None
-        self.pillow_quality_var = None
-        self.pillow_mode_var = None
-        self.pillow_scale_var = None
+        # 控件变量：名称 -> tk 变量（创建一次，参数面板切换时保留已输入的值）
+        self.vars: Dict[str, tk.Variable] = {}
         
         # UI子组件
         self.params_frame = None
         self.param_input_frame = None
+        # 各处理方式的参数面板和分辨率调整的输入面板（创建一次，切换时只显示/隐藏）
+        self._param_frames: Dict[str, ttk.Frame] = {}
+        self._resize_input_frames: Dict[str, ttk.Frame] = {}
         self.aspect_hint_label = None
         self.api_key_status_label = None
+        self.save_api_key_btn = None
         self.pillow_quality_hint_label = None
+        # 质量提示当前的 (文本, 颜色)，未变化时不再 config
+        self._quality_hint = None
         self.pillow_resize_frame = None
         self.select_output_btn = None
         self.process_btn = None
         self.stop_btn = None
         self.batch_process_btn = None
         
+        # 处理方式 -> 参数获取方法
+        self._param_builders: Dict[str, Callable[[], Optional[Dict[str, Any]]]] = {
+            "resize": self._get_resize_params,
+            "compress": self._get_tinypng_params,
+            "pillow_compress": self._get_pillow_compress_params,
+        }
+        
         # 状态
         self.is_processing = False
-        self.processing_thread = None
+        # 处理按钮是否可用（随按钮状态一起更新，查询时无需读取 Tk 组件状态）
+        self._can_process = False
         self.output_directory = None
+        # 尚未执行的延迟更新：名称 -> after id
+        self._pending_updates: Dict[str, str] = {}
+        # 整数输入框：组件路径 -> 名称；名称 -> (最小值, 最大值, 显示名称)
+        self._int_input_names: Dict[str, str] = {}
+        self._int_limits: Dict[str, Tuple[int, int, str]] = {}
+        # 整数输入框最近一次的有效值，当前输入无效（为空或超出范围）时为 None
+        self._int_values: Dict[str, Optional[int]] = {}
+        self._validate_int_cmd = None
+        # 配置保存和 API 密钥验证（磁盘/网络 I/O）在后台线程中执行，不阻塞界面
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="process-control-io")
+        # 参数和选项输入组件（创建时登记），set_enabled 时统一切换，无需遍历子组件
+        self._input_widgets: List[tk.Widget] = []
+        # 按钮当前状态（组件路径 -> state），状态未变化时不再调用 config
+        self._button_states: Dict[str, str] = {}
         
         self._create_widgets()
         self._setup_layout()
@@ -68,6 +112,9 @@ class ProcessControlManager:
     def _create_widgets(self):
         """创建处理控制组件"""
         self.control_frame = ttk.LabelFrame(self.parent, text="处理控制", padding="10")
+        self.control_frame.bind('<Destroy>', self._on_destroy)
+        ttk.Style(self.control_frame).configure(_HINT_STYLE, font=("Arial", 9), foreground="gray")
+        self.vars = self._create_variables()
         
         # 处理方式选择
         self._create_process_type_selection()
@@ -75,9 +122,17 @@ class ProcessControlManager:
         # 参数设置区域
         self.params_frame = ttk.Frame(self.control_frame)
         self.params_frame.pack(fill=tk.X, pady=(0, 10))
+        self._validate_int_cmd = self.control_frame.register(self._validate_int_input)
+        
+        # 预先创建所有参数面板，切换处理方式时不再销毁重建控件（也保留已输入的参数）
+        self._param_frames = {
+            "resize": self._create_resize_params(),
+            "compress": self._create_tinypng_params(),
+            "pillow_compress": self._create_pillow_compress_params(),
+        }
         
         # 初始化为调整分辨率参数
-        self.create_resize_params()
+        self.on_process_type_change()
         
         # 输出选项
         self._create_output_options()
@@ -85,6 +140,27 @@ class ProcessControlManager:
         # 处理按钮
         self._create_processing_buttons()
     
+    def _create_variables(self) -> Dict[str, tk.Variable]:
+        """创建所有控件变量及其初始值"""
+        current_api_key = self.config.get_tinypng_api_key()
+        api_key_value = current_api_key if current_api_key and current_api_key != _TINYPNG_KEY_PLACEHOLDER else _DEFAULT_TINYPNG_KEY
+        
+        return {
+            "process_type": tk.StringVar(value="resize"),
+            "resize_mode": tk.StringVar(value="percentage"),
+            "percentage": tk.IntVar(value=50),
+            "width": tk.IntVar(value=800),
+            "height": tk.IntVar(value=600),
+            "maintain_aspect": tk.BooleanVar(value=True),
+            "output_mode": tk.StringVar(value="new_folder"),
+            "output_format": tk.StringVar(value="保持原格式"),
+            "meta_override": tk.BooleanVar(value=False),
+            "tinypng_api_key": tk.StringVar(value=api_key_value),
+            "pillow_quality": tk.IntVar(value=85),
+            "pillow_mode": tk.StringVar(value="optimize"),
+            "pillow_scale": tk.IntVar(value=80),
+        }
+    
     def _create_process_type_selection(self):
         """创建处理方式选择"""
         process_frame = ttk.Frame(self.control_frame)
@@ -92,21 +168,21 @@ class ProcessControlManager:
         
         ttk.Label(process_frame, text="处理方式:").pack(side=tk.LEFT, padx=(0, 10))
         
-        self.process_type_var = tk.StringVar(value="resize")
         resize_radio = ttk.Radiobutton(process_frame, text="调整分辨率", 
-                                      variable=self.process_type_var, value="resize",
+                                      variable=self.vars["process_type"], value="resize",
                                       command=self.on_process_type_change)
         resize_radio.pack(side=tk.LEFT, padx=(0, 10))
         
         compress_radio = ttk.Radiobutton(process_frame, text="TinyPNG压缩", 
-                                        variable=self.process_type_var, value="compress",
+                                        variable=self.vars["process_type"], value="compress",
                                         command=self.on_process_type_change)
         compress_radio.pack(side=tk.LEFT, padx=(0, 10))
         
         pillow_compress_radio = ttk.Radiobutton(process_frame, text="Pillow压缩", 
-                                              variable=self.process_type_var, value="pillow_compress",
+                                              variable=self.vars["process_type"], value="pillow_compress",
                                               command=self.on_process_type_change)
         pillow_compress_radio.pack(side=tk.LEFT)
+        self._input_widgets.extend((resize_radio, compress_radio, pillow_compress_radio))
     
     def _create_output_options(self):
         """创建输出选项"""
@@ -115,24 +191,24 @@ class ProcessControlManager:
         
         ttk.Label(output_frame, text="输出方式:").pack(side=tk.LEFT, padx=(0, 10))
         
-        self.output_mode_var = tk.StringVar(value="new_folder")
         overwrite_radio = ttk.Radiobutton(output_frame, text="覆盖原图", 
-                                         variable=self.output_mode_var, value="overwrite")
+                                         variable=self.vars["output_mode"], value="overwrite")
         overwrite_radio.pack(side=tk.LEFT, padx=(0, 10))
         
         new_folder_radio = ttk.Radiobutton(output_frame, text="新建文件夹", 
-                                          variable=self.output_mode_var, value="new_folder")
+                                          variable=self.vars["output_mode"], value="new_folder")
         new_folder_radio.pack(side=tk.LEFT, padx=(0, 10))
         
         custom_dir_radio = ttk.Radiobutton(output_frame, text="指定目录", 
-                                          variable=self.output_mode_var, value="custom_dir")
+                                          variable=self.vars["output_mode"], value="custom_dir")
         custom_dir_radio.pack(side=tk.LEFT, padx=(0, 10))
+        self._input_widgets.extend((overwrite_radio, new_folder_radio, custom_dir_radio))
         
         self.select_output_btn = ttk.Button(output_frame, text="选择目录", 
                                           command=self._select_output_directory, state=tk.DISABLED)
         self.select_output_btn.pack(side=tk.LEFT)
         
-        self.output_mode_var.trace('w', self._on_output_mode_change)
+        self.vars["output_mode"].trace_add('write', self._on_output_mode_change)
     
     def _create_processing_buttons(self):
         """创建处理按钮"""
@@ -140,218 +216,279 @@ class ProcessControlManager:
         button_frame.pack(fill=tk.X)
         
         self.process_btn = ttk.Button(button_frame, text="处理图片",
-                                     command=lambda: self.process_image(), state=tk.DISABLED)
+                                     command=self.process_image, state=tk.DISABLED)
         self.process_btn.pack(side=tk.LEFT, padx=(0, 10))
 
         self.stop_btn = ttk.Button(button_frame, text="停止处理",
-                                  command=lambda: self.stop_processing(), state=tk.DISABLED)
+                                  command=self.stop_processing, state=tk.DISABLED)
         self.stop_btn.pack(side=tk.LEFT, padx=(0, 10))
 
         self.batch_process_btn = ttk.Button(button_frame, text="批量处理",
-                                           command=lambda: self.batch_process_images(), state=tk.DISABLED)
+                                           command=self.batch_process_images, state=tk.DISABLED)
         self.batch_process_btn.pack(side=tk.LEFT, padx=(10, 0))
         
         # 输出格式选择
         ttk.Label(button_frame, text="输出格式:").pack(side=tk.LEFT, padx=(10, 5))
         
-        self.output_format_var = tk.StringVar(value="保持原格式")
-        format_combo = ttk.Combobox(button_frame, textvariable=self.output_format_var, 
+        format_combo = ttk.Combobox(button_frame, textvariable=self.vars["output_format"], 
                                    values=["保持原格式", "JPEG", "PNG", "WEBP", "BMP", "TIFF"], 
                                    width=12, state="readonly")
         format_combo.pack(side=tk.LEFT, padx=(0, 10))
         
         # Meta覆盖选项
-        self.meta_override_var = tk.BooleanVar(value=False)
         meta_override_checkbox = ttk.Checkbutton(button_frame, text="Meta覆盖", 
-                                               variable=self.meta_override_var)
+                                               variable=self.vars["meta_override"])
         meta_override_checkbox.pack(side=tk.LEFT, padx=(10, 0))
+        self._input_widgets.extend((format_combo, meta_override_checkbox))
     
     def _setup_layout(self):
         """设置组件布局"""
         pass
     
-    def create_resize_params(self):
+    def _create_resize_params(self) -> ttk.Frame:
         """创建分辨率调整参数控件"""
-        for widget in self.params_frame.winfo_children():
-            widget.destroy()
+        frame = ttk.Frame(self.params_frame)
         
-        ttk.Label(self.params_frame, text="调整方式:").pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Label(frame, text="调整方式:").pack(side=tk.LEFT, padx=(0, 10))
         
-        self.resize_mode_var = tk.StringVar(value="percentage")
-        percentage_radio = ttk.Radiobutton(self.params_frame, text="百分比", 
-                                          variable=self.resize_mode_var, value="percentage",
+        percentage_radio = ttk.Radiobutton(frame, text="百分比", 
+                                          variable=self.vars["resize_mode"], value="percentage",
                                           command=self._on_resize_mode_change)
         percentage_radio.pack(side=tk.LEFT, padx=(0, 10))
         
-        dimensions_radio = ttk.Radiobutton(self.params_frame, text="指定尺寸", 
-                                          variable=self.resize_mode_var, value="dimensions",
+        dimensions_radio = ttk.Radiobutton(frame, text="指定尺寸", 
+                                          variable=self.vars["resize_mode"], value="dimensions",
                                           command=self._on_resize_mode_change)
         dimensions_radio.pack(side=tk.LEFT)
+        self._input_widgets.extend((percentage_radio, dimensions_radio))
         
-        self.param_input_frame = ttk.Frame(self.params_frame)
+        self.param_input_frame = ttk.Frame(frame)
         self.param_input_frame.pack(side=tk.LEFT, padx=(20, 0))
         
+        self._resize_input_frames = {
+            "percentage": self._create_percentage_input(),
+            "dimensions": self._create_dimensions_input(),
+        }
         self._on_resize_mode_change()
+        return frame
     
-    def _create_percentage_input(self):
+    def _create_percentage_input(self) -> ttk.Frame:
         """创建百分比输入控件"""
-        for widget in self.param_input_frame.winfo_children():
-            widget.destroy()
+        frame = ttk.Frame(self.param_input_frame)
         
-        ttk.Label(self.param_input_frame, text="百分比:").pack(side=tk.LEFT)
+        ttk.Label(frame, text="百分比:").pack(side=tk.LEFT)
         
-        self.percentage_var = tk.StringVar(value="50")
-        percentage_spinbox = ttk.Spinbox(self.param_input_frame, from_=1, to=200, 
-                                       textvariable=self.percentage_var, width=10)
+        percentage_spinbox = ttk.Spinbox(frame, from_=1, to=200, 
+                                       textvariable=self.vars["percentage"], width=10)
         percentage_spinbox.pack(side=tk.LEFT, padx=(5, 10))
+        self._bind_int_input(percentage_spinbox, "percentage", self.vars["percentage"], 1, 200, "百分比")
+        self._input_widgets.append(percentage_spinbox)
         
-        ttk.Label(self.param_input_frame, text="%").pack(side=tk.LEFT)
+        ttk.Label(frame, text="%").pack(side=tk.LEFT)
+        return frame
     
-    def _create_dimensions_input(self):
+    def _create_dimensions_input(self) -> ttk.Frame:
         """创建尺寸输入控件"""
-        for widget in self.param_input_frame.winfo_children():
-            widget.destroy()
+        frame = ttk.Frame(self.param_input_frame)
         
-        size_frame = ttk.Frame(self.param_input_frame)
+        size_frame = ttk.Frame(frame)
         size_frame.pack(side=tk.TOP, pady=(0, 10))
         
         ttk.Label(size_frame, text="宽度:").pack(side=tk.LEFT)
         
-        self.width_var = tk.StringVar(value="800")
         width_spinbox = ttk.Spinbox(size_frame, from_=1, to=5000, 
-                                   textvariable=self.width_var, width=10)
+                                   textvariable=self.vars["width"], width=10)
         width_spinbox.pack(side=tk.LEFT, padx=(5, 10))
+        self._bind_int_input(width_spinbox, "width", self.vars["width"], 1, 5000, "宽度")
         
         ttk.Label(size_frame, text="高度:").pack(side=tk.LEFT)
         
-        self.height_var = tk.StringVar(value="600")
         height_spinbox = ttk.Spinbox(size_frame, from_=1, to=5000, 
-                                    textvariable=self.height_var, width=10)
+                                    textvariable=self.vars["height"], width=10)
         height_spinbox.pack(side=tk.LEFT, padx=(5, 0))
+        self._bind_int_input(height_spinbox, "height", self.vars["height"], 1, 5000, "高度")
         
-        aspect_frame = ttk.Frame(self.param_input_frame)
+        aspect_frame = ttk.Frame(frame)
         aspect_frame.pack(side=tk.TOP)
         
-        self.maintain_aspect_var = tk.BooleanVar(value=True)
         aspect_check = ttk.Checkbutton(aspect_frame, text="保持宽高比", 
-                                      variable=self.maintain_aspect_var,
+                                      variable=self.vars["maintain_aspect"],
                                       command=self._on_aspect_ratio_change)
         aspect_check.pack(side=tk.LEFT, padx=(0, 10))
+        self._input_widgets.extend((width_spinbox, height_spinbox, aspect_check))
         
-        self.aspect_hint_label = ttk.Label(aspect_frame, text="(保持比例，图片可能不完全匹配指定尺寸)", 
-                                         foreground="gray", font=("Arial", 9))
+        self.aspect_hint_label = ttk.Label(aspect_frame, text=_ASPECT_HINTS[self.vars["maintain_aspect"].get()], 
+                                         style=_HINT_STYLE)
         self.aspect_hint_label.pack(side=tk.LEFT)
+        return frame
     
-    def create_tinypng_params(self):
+    def _create_tinypng_params(self) -> ttk.Frame:
         """创建TinyPNG压缩参数控件"""
-        for widget in self.params_frame.winfo_children():
-            widget.destroy()
+        frame = ttk.Frame(self.params_frame)
         
-        api_key_frame = ttk.Frame(self.params_frame)
+        api_key_frame = ttk.Frame(frame)
         api_key_frame.pack(side=tk.LEFT, padx=(0, 10))
         
         ttk.Label(api_key_frame, text="API KEY:").pack(side=tk.LEFT, padx=(0, 5))
         
-        current_api_key = self.config.get_tinypng_api_key()
-        default_api_key = "4PGdmZhdCHG9NJ53VMl2kTZfcFCFTTNH"
-        api_key_value = current_api_key if current_api_key and current_api_key != 'your_tinypng_api_key_here' else default_api_key
-        
-        self.tinypng_api_key_var = tk.StringVar(value=api_key_value)
-        api_key_entry = ttk.Entry(api_key_frame, textvariable=self.tinypng_api_key_var, width=40)
+        api_key_entry = ttk.Entry(api_key_frame, textvariable=self.vars["tinypng_api_key"], width=40)
         api_key_entry.pack(side=tk.LEFT, padx=(5, 10))
         
-        save_api_key_btn = ttk.Button(api_key_frame, text="保存", command=self._save_tinypng_api_key)
-        save_api_key_btn.pack(side=tk.LEFT)
+        self.save_api_key_btn = ttk.Button(api_key_frame, text="保存", command=self._save_tinypng_api_key)
+        self.save_api_key_btn.pack(side=tk.LEFT)
+        self._input_widgets.extend((api_key_entry, self.save_api_key_btn))
         
-        self.api_key_status_label = ttk.Label(api_key_frame, text="", foreground="gray", font=("Arial", 9))
+        self.api_key_status_label = ttk.Label(api_key_frame, text="", style=_HINT_STYLE)
         self.api_key_status_label.pack(side=tk.LEFT, padx=(10, 0))
         
         self._update_api_key_status()
+        return frame
     
-    def create_pillow_compress_params(self):
+    def _create_pillow_compress_params(self) -> ttk.Frame:
         """创建Pillow压缩参数控件"""
-        for widget in self.params_frame.winfo_children():
-            widget.destroy()
+        frame = ttk.Frame(self.params_frame)
         
-        quality_frame = ttk.Frame(self.params_frame)
+        quality_frame = ttk.Frame(frame)
         quality_frame.pack(side=tk.LEFT, padx=(0, 20))
         
         ttk.Label(quality_frame, text="压缩质量:").pack(side=tk.LEFT, padx=(0, 5))
         
-        self.pillow_quality_var = tk.StringVar(value="85")
         quality_spinbox = ttk.Spinbox(quality_frame, from_=1, to=100, 
-                                    textvariable=self.pillow_quality_var, width=10)
+                                    textvariable=self.vars["pillow_quality"], width=10)
         quality_spinbox.pack(side=tk.LEFT, padx=(5, 5))
+        self._bind_int_input(quality_spinbox, "pillow_quality", self.vars["pillow_quality"], 1, 100, "压缩质量")
         
-        self.pillow_quality_hint_label = ttk.Label(quality_frame, text="(1-100, 数值越小压缩率越高)", 
-                                                  foreground="gray", font=("Arial", 9))
+        self.pillow_quality_hint_label = ttk.Label(quality_frame, text=_QUALITY_HINT_DEFAULT[0], 
+                                                  style=_HINT_STYLE)
         self.pillow_quality_hint_label.pack(side=tk.LEFT)
         
-        self.pillow_quality_var.trace('w', self._on_pillow_quality_change)
+        self.vars["pillow_quality"].trace_add('write', self._on_pillow_quality_change)
         
-        mode_frame = ttk.Frame(self.params_frame)
+        mode_frame = ttk.Frame(frame)
         mode_frame.pack(side=tk.LEFT, padx=(0, 10))
         
         ttk.Label(mode_frame, text="压缩模式:").pack(side=tk.LEFT, padx=(0, 5))
         
-        self.pillow_mode_var = tk.StringVar(value="optimize")
         optimize_radio = ttk.Radiobutton(mode_frame, text="优化质量", 
-                                       variable=self.pillow_mode_var, value="optimize")
+                                       variable=self.vars["pillow_mode"], value="optimize")
         optimize_radio.pack(side=tk.LEFT, padx=(0, 5))
         
         resize_radio = ttk.Radiobutton(mode_frame, text="缩放压缩", 
-                                     variable=self.pillow_mode_var, value="resize_optimize")
+                                     variable=self.vars["pillow_mode"], value="resize_optimize")
         resize_radio.pack(side=tk.LEFT)
+        self._input_widgets.extend((quality_spinbox, optimize_radio, resize_radio))
         
-        self.pillow_resize_frame = ttk.Frame(self.params_frame)
+        self.pillow_resize_frame = ttk.Frame(frame)
         self.pillow_resize_frame.pack(side=tk.LEFT, padx=(20, 0))
         
         ttk.Label(self.pillow_resize_frame, text="缩放比例:").pack(side=tk.LEFT)
         
-        self.pillow_scale_var = tk.StringVar(value="80")
         scale_spinbox = ttk.Spinbox(self.pillow_resize_frame, from_=10, to=100, 
-                                  textvariable=self.pillow_scale_var, width=10)
+                                  textvariable=self.vars["pillow_scale"], width=10)
         scale_spinbox.pack(side=tk.LEFT, padx=(5, 5))
+        self._bind_int_input(scale_spinbox, "pillow_scale", self.vars["pillow_scale"], 10, 100, "缩放比例")
+        self._input_widgets.append(scale_spinbox)
         
         ttk.Label(self.pillow_resize_frame, text="%").pack(side=tk.LEFT)
         
-        self.pillow_mode_var.trace('w', self._on_pillow_mode_change)
+        self.vars["pillow_mode"].trace_add('write', self._on_pillow_mode_change)
         
         self._on_pillow_mode_change()
-        self._on_pillow_quality_change()
+        self._apply_pillow_quality_hint()
+        return frame
+    
+    def _bind_int_input(self, spinbox: ttk.Spinbox, name: str, var: tk.IntVar,
+                        minimum: int, maximum: int, display_name: str):
+        """
+        限制输入框只能输入整数，并在变量变化时缓存解析后的值
+        
+        Args:
+            spinbox: 输入框
+            name: 缓存名称
+            var: 输入框绑定的变量
+            minimum: 最小值
+            maximum: 最大值
+            display_name: 错误提示中显示的名称
+        """
+        self._int_input_names[str(spinbox)] = name
+        self._int_limits[name] = (minimum, maximum, display_name)
+        spinbox.configure(validate='key', validatecommand=(self._validate_int_cmd, '%P', '%W'))
+        # 箭头按钮和程序赋值不经过按键校验，通过变量跟踪更新缓存
+        var.trace_add('write', lambda *args: self._cache_int_value(name, var, minimum, maximum))
+        self._cache_int_value(name, var, minimum, maximum)
+    
+    def _validate_int_input(self, proposed: str, widget_name: str) -> bool:
+        """按键校验：只允许输入不超过上限的数字（允许清空，输入过程中允许暂时低于下限）"""
+        if proposed == "":
+            return True
+        # 不允许前导零（IntVar 无法解析 "08" 这样的值）
+        if not proposed.isdigit() or (len(proposed) > 1 and proposed[0] == "0"):
+            return False
+        return int(proposed) <= self._int_limits[self._int_input_names[widget_name]][1]
+    
+    def _cache_int_value(self, name: str, var: tk.IntVar, minimum: int, maximum: int):
+        """缓存输入框的整数值，无效时记为 None"""
+        try:
+            value = var.get()
+        except tk.TclError:
+            # 输入框被清空
+            value = None
+        self._int_values[name] = value if value is not None and minimum <= value <= maximum else None
+    
+    def _get_int_param(self, name: str) -> Optional[int]:
+        """读取缓存的整数参数，无效时提示错误并返回 None"""
+        value = self._int_values.get(name)
+        if value is None:
+            minimum, maximum, display_name = self._int_limits[name]
+            messagebox.showerror("参数错误", f"{display_name}必须是 {minimum}-{maximum} 之间的整数")
+        return value
+    
+    def _show_frame(self, frames: Dict[str, ttk.Frame], key: str, **pack_options):
+        """在一组预先创建的面板中只显示指定的一个"""
+        for name, frame in frames.items():
+            if name != key:
+                frame.pack_forget()
+        frame = frames.get(key)
+        if frame is not None:
+            frame.pack(**pack_options)
     
     def on_process_type_change(self):
         """处理方式变化时的处理"""
-        process_type = self.process_type_var.get()
-        if process_type == "resize":
-            self.create_resize_params()
-        elif process_type == "compress":
-            self.create_tinypng_params()
-        elif process_type == "pillow_compress":
-            self.create_pillow_compress_params()
+        self._show_frame(self._param_frames, self.vars["process_type"].get(), fill=tk.X)
     
     def _on_resize_mode_change(self):
         """调整方式变化时的处理"""
-        resize_mode = self.resize_mode_var.get()
-        if resize_mode == "percentage":
-            self._create_percentage_input()
-        else:
-            self._create_dimensions_input()
+        self._show_frame(self._resize_input_frames, self.vars["resize_mode"].get(), side=tk.LEFT)
+    
+    def _schedule_update(self, name: str, callback: Callable[[], None]):
+        """延迟执行界面更新，期间再次触发时重新计时，连续变化只执行最后一次"""
+        after_id = self._pending_updates.pop(name, None)
+        if after_id is not None:
+            self.control_frame.after_cancel(after_id)
+        
+        def run():
+            self._pending_updates.pop(name, None)
+            callback()
+        
+        self._pending_updates[name] = self.control_frame.after(_OPTION_UPDATE_DELAY_MS, run)
     
     def _on_aspect_ratio_change(self):
         """处理宽高比选项变更"""
-        if self.maintain_aspect_var.get():
-            self.aspect_hint_label.config(text="(保持比例，图片可能不完全匹配指定尺寸)")
-        else:
-            self.aspect_hint_label.config(text="(强制调整，图片将完全匹配指定尺寸，可能变形)")
+        self._schedule_update("aspect_ratio", self._apply_aspect_ratio_change)
+    
+    def _apply_aspect_ratio_change(self):
+        """根据宽高比选项更新提示"""
+        self.aspect_hint_label.config(text=_ASPECT_HINTS[self.vars["maintain_aspect"].get()])
     
     def _on_output_mode_change(self, *args):
         """输出方式变化时的处理"""
-        output_mode = self.output_mode_var.get()
-        if output_mode == "custom_dir":
-            self.select_output_btn.config(state=tk.NORMAL)
-        else:
-            self.select_output_btn.config(state=tk.DISABLED)
+        self._schedule_update("output_mode", self._apply_output_mode_change)
+    
+    def _apply_output_mode_change(self):
+        """根据输出方式启用/禁用选择目录按钮"""
+        output_mode = self.vars["output_mode"].get()
+        self._set_button_state(self.select_output_btn,
+                               tk.NORMAL if output_mode == "custom_dir" else tk.DISABLED)
     
     def _select_output_directory(self):
         """选择输出目录"""
@@ -362,38 +499,36 @@ class ProcessControlManager:
     
     def _on_pillow_mode_change(self, *args):
         """处理Pillow压缩模式变化"""
-        if hasattr(self, 'pillow_mode_var') and hasattr(self, 'pillow_resize_frame'):
-            if self.pillow_mode_var.get() == "resize_optimize":
+        if self.pillow_resize_frame is not None:
+            if self.vars["pillow_mode"].get() == "resize_optimize":
                 self.pillow_resize_frame.pack(side=tk.LEFT, padx=(20, 0))
             else:
                 self.pillow_resize_frame.pack_forget()
     
     def _on_pillow_quality_change(self, *args):
-        """处理Pillow压缩质量变化"""
-        if hasattr(self, 'pillow_quality_var') and hasattr(self, 'pillow_quality_hint_label'):
-            try:
-                quality = int(self.pillow_quality_var.get())
-                if quality <= 10:
-                    hint_text, color = "(极限压缩: 极小文件，严重失真)", "red"
-                elif quality <= 30:
-                    hint_text, color = "(高压缩: 小文件，明显失真)", "orange"
-                elif quality <= 50:
-                    hint_text, color = "(中等压缩: 较小文件，轻微失真)", "blue"
-                elif quality <= 75:
-                    hint_text, color = "(轻度压缩: 轻微减小，质量良好)", "green"
-                else:
-                    hint_text, color = "(高质量: 文件较大，质量优秀)", "darkgreen"
-                
-                self.pillow_quality_hint_label.config(text=f"({quality}/100 {hint_text[1:]})", foreground=color)
-            except ValueError:
-                self.pillow_quality_hint_label.config(text="(1-100, 数值越小压缩率越高)", foreground="gray")
+        """处理Pillow压缩质量变化（连续输入或按住箭头时合并为一次提示更新）"""
+        self._schedule_update("pillow_quality", self._apply_pillow_quality_hint)
+    
+    def _apply_pillow_quality_hint(self):
+        """根据压缩质量更新提示文本和颜色"""
+        if self.pillow_quality_hint_label is None:
+            return
+        # 读取输入校验时缓存的整数值，不再单独解析输入框
+        quality = self._int_values.get("pillow_quality")
+        hint = _QUALITY_HINT_DEFAULT
+        if quality is not None:
+            for threshold, color, description in _QUALITY_BUCKETS:
+                if quality <= threshold:
+                    hint = (f"({quality}/100 {description})", color)
+                    break
+        
+        if hint != self._quality_hint:
+            self._quality_hint = hint
+            self.pillow_quality_hint_label.config(text=hint[0], foreground=hint[1])
     
     def _save_tinypng_api_key(self):
         """保存TinyPNG API密钥"""
-        if not hasattr(self, 'tinypng_api_key_var'):
-            return
-        
-        api_key = self.tinypng_api_key_var.get().strip()
+        api_key = self.vars["tinypng_api_key"].get().strip()
         
         if len(api_key) < 10:
             messagebox.showerror("API密钥错误", "API密钥长度不足，请检查输入")
@@ -401,131 +536,166 @@ class ProcessControlManager:
         
         try:
             self.config.set_tinypng_api_key(api_key)
-            self.config.save_config()
             self.processor.set_tinypng_api_key(api_key)
-            
-            if self.processor.validate_tinypng_api_key(api_key):
-                messagebox.showinfo("保存成功", "API密钥保存成功且验证通过")
-                self.api_key_status_label.config(text="(API密钥有效)", foreground="green")
-            else:
-                messagebox.showwarning("保存成功", "API密钥已保存，但验证失败，请检查网络连接或密钥正确性")
-                self.api_key_status_label.config(text="(API密钥验证失败)", foreground="orange")
-                
         except Exception as e:
             messagebox.showerror("保存失败", f"保存API密钥失败: {str(e)}")
+            return
+        
+        # 写入配置文件和联网验证在后台执行，完成后回到主线程提示结果
+        self._set_button_state(self.save_api_key_btn, tk.DISABLED)
+        self.api_key_status_label.config(text="(正在验证API密钥...)", foreground="gray")
+        future = self._io_pool.submit(self._save_and_validate_api_key, api_key)
+        future.add_done_callback(lambda f: self.control_frame.after(0, self._on_api_key_saved, f))
+    
+    def _save_and_validate_api_key(self, api_key: str) -> bool:
+        """保存配置并验证API密钥（在后台线程中执行）"""
+        self.config.save_config()
+        return self.processor.validate_tinypng_api_key(api_key)
+    
+    def _on_api_key_saved(self, future: Future):
+        """API密钥保存和验证完成（主线程）"""
+        self._set_button_state(self.save_api_key_btn, tk.NORMAL)
+        try:
+            valid = future.result()
+        except Exception as e:
+            self._update_api_key_status()
+            messagebox.showerror("保存失败", f"保存API密钥失败: {str(e)}")
+            return
+        
+        if valid:
+            self.api_key_status_label.config(text="(API密钥有效)", foreground="green")
+            messagebox.showinfo("保存成功", "API密钥保存成功且验证通过")
+        else:
+            self.api_key_status_label.config(text="(API密钥验证失败)", foreground="orange")
+            messagebox.showwarning("保存成功", "API密钥已保存，但验证失败，请检查网络连接或密钥正确性")
+    
+    def _on_destroy(self, event):
+        """组件销毁时丢弃尚未开始的后台任务"""
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
     
     def _update_api_key_status(self):
         """更新API密钥状态"""
-        api_key = self.tinypng_api_key_var.get() if hasattr(self, 'tinypng_api_key_var') else ''
+        api_key = self.vars["tinypng_api_key"].get()
         if api_key:
-            if api_key == "4PGdmZhdCHG9NJ53VMl2kTZfcFCFTTNH":
+            if api_key == _DEFAULT_TINYPNG_KEY:
                 status_text, color = "(使用默认API密钥)", "green"
             else:
                 status_text, color = "(自定义API密钥)", "blue"
         else:
             status_text, color = "(未设置API密钥)", "red"
         
-        if hasattr(self, 'api_key_status_label'):
+        if self.api_key_status_label is not None:
             self.api_key_status_label.config(text=status_text, foreground=color)
     
     def get_process_params(self) -> Optional[Dict[str, Any]]:
-        """获取处理参数"""
-        process_type = self.process_type_var.get()
-        
-        if process_type == "resize":
-            resize_mode = self.resize_mode_var.get()
-            if resize_mode == "percentage":
-                resize_value = int(self.percentage_var.get())
-            else:
-                width = int(self.width_var.get())
-                height = int(self.height_var.get())
-                resize_value = (width, height)
-            
-            params = {
-                'resize_mode': resize_mode,
-                'resize_value': resize_value,
-                'quality': 85
-            }
-            
-            if resize_mode == "dimensions":
-                params['maintain_aspect'] = self.maintain_aspect_var.get()
-            
-        elif process_type == "compress":
-            if hasattr(self, 'tinypng_api_key_var'):
-                api_key = self.tinypng_api_key_var.get().strip()
-                if api_key:
-                    self.processor.set_tinypng_api_key(api_key)
-                    params = {}
-                else:
-                    messagebox.showerror("API密钥错误", "请先输入TinyPNG API密钥")
-                    return None
-            else:
-                messagebox.showerror("API密钥错误", "请先输入TinyPNG API密钥")
-                return None
-        elif process_type == "pillow_compress":
-            if hasattr(self, 'pillow_quality_var') and hasattr(self, 'pillow_mode_var'):
-                params = {
-                    'quality': int(self.pillow_quality_var.get()),
-                    'mode': self.pillow_mode_var.get()
-                }
-                
-                if self.pillow_mode_var.get() == "resize_optimize" and hasattr(self, 'pillow_scale_var'):
-                    params['scale'] = int(self.pillow_scale_var.get())
-            else:
-                messagebox.showerror("参数错误", "Pillow压缩参数设置错误")
+        """获取处理参数（参数无效时提示错误并返回 None）"""
+        build_params = self._param_builders.get(self.vars["process_type"].get())
+        params = build_params() if build_params else {}
+        if params is None:
+            return None
+        
+        output_format = self.vars["output_format"].get()
+        if output_format != "保持原格式":
+            params['output_format'] = output_format
+            if output_format in ["JPEG", "WEBP"] and 'quality' not in params:
+                params['quality'] = 85
+        
+        params['meta_override'] = self.vars["meta_override"].get()
+        return params
+    
+    def _get_resize_params(self) -> Optional[Dict[str, Any]]:
+        """获取分辨率调整参数"""
+        resize_mode = self.vars["resize_mode"].get()
+        if resize_mode == "percentage":
+            resize_value = self._get_int_param("percentage")
+            if resize_value is None:
                 return None
         else:
-            params = {}
-        
-        if not 'params' in locals():
-            params = {}
-        
-        if hasattr(self, 'output_format_var'):
-            output_format = self.output_format_var.get()
-            if output_format != "保持原格式":
-                params['output_format'] = output_format
-                if output_format in ["JPEG", "WEBP"] and 'quality' not in params:
-                    params['quality'] = 85
-        
-        if hasattr(self, 'meta_override_var'):
-            params['meta_override'] = self.meta_override_var.get()
-        
+            width = self._get_int_param("width")
+            height = self._get_int_param("height") if width is not None else None
+            if height is None:
+                return None
+            resize_value = (width, height)
+        
+        # 按百分比缩放本身就保持宽高比
+        return {
+            'resize_mode': resize_mode,
+            'resize_value': resize_value,
+            'quality': 85,
+            'maintain_aspect': self.vars["maintain_aspect"].get() if resize_mode == "dimensions" else True
+        }
+    
+    def _get_tinypng_params(self) -> Optional[Dict[str, Any]]:
+        """获取TinyPNG压缩参数（同时把当前输入的API密钥交给处理器）"""
+        api_key = self.vars["tinypng_api_key"].get().strip()
+        if not api_key:
+            messagebox.showerror("API密钥错误", "请先输入TinyPNG API密钥")
+            return None
+        self.processor.set_tinypng_api_key(api_key)
+        return {}
+    
+    def _get_pillow_compress_params(self) -> Optional[Dict[str, Any]]:
+        """获取Pillow压缩参数"""
+        quality = self._get_int_param("pillow_quality")
+        if quality is None:
+            return None
+        mode = self.vars["pillow_mode"].get()
+        params = {
+            'quality': quality,
+            'mode': mode
+        }
+        
+        if mode == "resize_optimize":
+            scale = self._get_int_param("pillow_scale")
+            if scale is None:
+                return None
+            params['scale'] = scale
         return params
     
     def process_image(self):
-        """处理当前图片（占位方法，由主窗口连接）"""
-        pass
+        """处理当前图片（调用主窗口通过 set_process_handlers 设置的处理函数）"""
+        if self.on_process_callback:
+            self.on_process_callback()
     
     def batch_process_images(self):
-        """批量处理图片（占位方法，由主窗口连接）"""
-        pass
+        """批量处理图片（调用主窗口通过 set_process_handlers 设置的处理函数）"""
+        if self.on_batch_process_callback:
+            self.on_batch_process_callback()
     
     def stop_processing(self):
         """停止处理"""
         self.processor.stop_all_processing()
         logger.info("正在停止处理...")
     
+    def _set_button_state(self, button: ttk.Button, state: str):
+        """设置按钮状态，与当前状态相同时跳过"""
+        key = str(button)
+        if self._button_states.get(key) != state:
+            button.config(state=state)
+            self._button_states[key] = state
+    
     def set_processing_state(self, is_processing: bool):
         """设置处理状态"""
         self.is_processing = is_processing
-        if is_processing:
-            self.process_btn.config(state=tk.DISABLED)
-            self.batch_process_btn.config(state=tk.DISABLED)
-            self.stop_btn.config(state=tk.NORMAL)
-        else:
-            self.process_btn.config(state=tk.NORMAL)
-            self.batch_process_btn.config(state=tk.NORMAL)
-            self.stop_btn.config(state=tk.DISABLED)
+        self._can_process = not is_processing
+        idle_state = tk.DISABLED if is_processing else tk.NORMAL
+        self._set_button_state(self.process_btn, idle_state)
+        self._set_button_state(self.batch_process_btn, idle_state)
+        self._set_button_state(self.stop_btn, tk.NORMAL if is_processing else tk.DISABLED)
     
     def enable_processing(self, enable: bool = True):
         """启用/禁用处理按钮"""
-        state = tk.NORMAL if enable else tk.DISABLED
-        self.process_btn.config(state=state)
+        self._can_process = enable
+        self._set_button_state(self.process_btn, tk.NORMAL if enable else tk.DISABLED)
     
     def enable_batch_processing(self, enable: bool = True):
         """启用/禁用批量处理按钮"""
-        state = tk.NORMAL if enable else tk.DISABLED
-        self.batch_process_btn.config(state=state)
+        self._set_button_state(self.batch_process_btn, tk.NORMAL if enable else tk.DISABLED)
+    
+    def set_process_handlers(self, on_process: Callable = None, on_batch_process: Callable = None):
+        """设置处理按钮和批量处理按钮的处理函数"""
+        self.on_process_callback = on_process
+        self.on_batch_process_callback = on_batch_process
     
     def set_callbacks(self, on_process_complete: Callable = None,
                      on_process_error: Callable = None,
@@ -537,9 +707,23 @@ class ProcessControlManager:
         self.on_batch_progress_callback = on_batch_progress
         self.on_batch_complete_callback = on_batch_complete
     
+    def set_enabled(self, enabled: bool):
+        """启用/禁用参数和选项输入组件（处理按钮的状态由处理流程单独控制）"""
+        # ttk 的 state 标志只切换 disabled，不影响只读下拉框的 readonly 标志
+        state_spec = ('!disabled',) if enabled else ('disabled',)
+        for widget in self._input_widgets:
+            widget.state(state_spec)
+    
+    def get_state(self) -> Dict[str, bool]:
+        """获取处理控制状态"""
+        return {
+            'is_processing': self.is_processing,
+            'can_process': self._can_process,
+        }
+    
     def get_output_mode(self) -> str:
         """获取输出模式"""
-        return self.output_mode_var.get()
+        return self.vars["output_mode"].get()
     
     def get_output_directory(self) -> Optional[str]:
         """获取输出目录"""
@@ -547,7 +731,7 @@ class ProcessControlManager:
     
     def get_process_type(self) -> str:
         """获取处理类型"""
-        return self.process_type_var.get()
+        return self.vars["process_type"].get()
     
     def grid(self, **kwargs):
         """放置处理控制区域到指定位置"""
@@ -5,11 +5,13 @@
 
 import tkinter as tk
 from tkinter import ttk
-from typing import Optional
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 进度条显示精度：百分比按 0.1 取整，变化小于该精度时不更新进度条
+_PROGRESS_STEPS_PER_PERCENT = 10
+
 
 class StatusBarManager:
     """状态栏管理器类"""
@@ -26,6 +28,10 @@ class StatusBarManager:
         self.status_label = None
         self.progress_bar = None
         self.progress_var = tk.DoubleVar()
+        # 当前显示的进度（按显示精度取整后的步数），未变化时不再更新
+        self._progress_step = 0
+        # 当前显示的状态文本
+        self._status_text = "就绪"
         
         self._create_widgets()
         self._setup_layout()
@@ -34,7 +40,7 @@ class StatusBarManager:
         """创建状态栏组件"""
         self.status_frame = ttk.Frame(self.parent)
         
-        self.status_label = ttk.Label(self.status_frame, text="就绪", relief=tk.SUNKEN)
+        self.status_label = ttk.Label(self.status_frame, text=self._status_text, relief=tk.SUNKEN)
         
         self.progress_bar = ttk.Progressbar(
             self.status_frame,
@@ -55,8 +61,11 @@ class StatusBarManager:
         Args:
             text: 状态文本
         """
+        if text == self._status_text:
+            return
+        self._status_text = text
         self.status_label.config(text=text)
-        logger.debug(f"状态更新: {text}")
+        logger.debug("状态更新: %s", text)
     
     def set_progress(self, percentage: float):
         """
@@ -65,11 +74,16 @@ class StatusBarManager:
         Args:
             percentage: 进度百分比 (0-100)
         """
-        self.progress_var.set(percentage)
+        step = int(percentage * _PROGRESS_STEPS_PER_PERCENT)
+        if step != self._progress_step:
+            self._progress_step = step
+            self.progress_var.set(step / _PROGRESS_STEPS_PER_PERCENT)
     
     def reset_progress(self):
-        """重置进度条"""
-        self.progress_var.set(0)
+        """重置进度条（已为 0 时跳过）"""
+        if self._progress_step != 0:
+            self._progress_step = 0
+            self.progress_var.set(0)
     
     def grid(self, **kwargs):
         """放置状态栏到指定位置"""
@@ -6,14 +6,13 @@ ImageForge - Python GUI Image Processor
 
 import sys
 import os
+import locale
 import tkinter as tk
-from tkinter import messagebox
-from PIL import Image, ImageTk
+from tkinter import ttk, messagebox
 
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from gui.main_window import ImageProcessorGUI
 from core.config import Config
 from core.config_validator import validate_config
 from utils.logger import setup_logging, get_logger
@@ -25,6 +24,12 @@ logger = get_logger(__name__)
 def main():
     """主程序入口函数"""
     try:
+        # 文件名排序使用系统区域设置的排序规则
+        try:
+            locale.setlocale(locale.LC_COLLATE, '')
+        except locale.Error as e:
+            logger.warning(f"无法设置区域排序规则，文件名按字符编码排序: {e}")
+        
         # 初始化配置
         config = Config()
         
@@ -52,6 +57,13 @@ def main():
             except Exception as icon_error:
                 logger.warning(f"Warning: Could not set window icon: {icon_error}")
         
+        # 先显示窗口，再导入界面模块（包含 Pillow 等较重的依赖）
+        loading_label = ttk.Label(root, text="正在加载...")
+        loading_label.pack(expand=True)
+        root.update()
+        from gui.main_window import ImageProcessorGUI
+        loading_label.destroy()
+        
         # 创建应用实例
         app = ImageProcessorGUI(root, config)
         
@@ -1,6 +1,5 @@
 # py_src/asset_cleaner.py - Finds and cleans unused assets
 import os
-import json
 from collections import defaultdict
 from . import file_helper
 from . import utils
@@ -3,10 +3,22 @@ Asset Cleaner Module
 A tool for analyzing and cleaning unused assets in Cocos Creator projects.
 """
 
-from .asset_cleaner import AssetCleaner, start as clean_start
-from .asset_size_analyzer import AssetSizeAnalyzer, start as size_start
-from .file_helper import get_full_path, write_file, get_object_from_file, get_file_string
-from .utils import byte_to_mb_str, byte_to_kb_str
+import importlib
+
+# Exported name -> (submodule, attribute). Submodules are imported on first
+# access (PEP 562), so importing the package does not load the analyzers.
+_LAZY_EXPORTS = {
+    'AssetCleaner': ('.asset_cleaner', 'AssetCleaner'),
+    'clean_start': ('.asset_cleaner', 'start'),
+    'AssetSizeAnalyzer': ('.asset_size_analyzer', 'AssetSizeAnalyzer'),
+    'size_start': ('.asset_size_analyzer', 'start'),
+    'get_full_path': ('.file_helper', 'get_full_path'),
+    'write_file': ('.file_helper', 'write_file'),
+    'get_object_from_file': ('.file_helper', 'get_object_from_file'),
+    'get_file_string': ('.file_helper', 'get_file_string'),
+    'byte_to_mb_str': ('.utils', 'byte_to_mb_str'),
+    'byte_to_kb_str': ('.utils', 'byte_to_kb_str'),
+}
 
 __all__ = [
     'AssetCleaner',
@@ -19,4 +31,18 @@ __all__ = [
     'get_file_string',
     'byte_to_mb_str',
     'byte_to_kb_str'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
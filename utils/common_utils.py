@@ -3,7 +3,7 @@
 提供可复用的工具函数
 """
 
-from typing import Tuple, Optional
+from typing import Tuple
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -29,37 +29,19 @@ def format_file_size(size_bytes: int) -> str:
         return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
 
 
-def get_image_info_text(processor, image_path: str) -> str:
+def format_image_info_text(width: int, height: int, size_bytes: int) -> str:
     """
-    获取图片信息文本（分辨率和文件大小）
+    格式化图片信息文本（分辨率和文件大小），用于调用方已掌握图片尺寸和文件大小的场景
     
     Args:
-        processor: 图像处理器实例
-        image_path: 图像文件路径
+        width: 图片宽度
+        height: 图片高度
+        size_bytes: 文件大小（字节）
         
     Returns:
         str: 图片信息文本
     """
-    import os
-    
-    try:
-        resolution = "未知分辨率"
-        file_size = "未知大小"
-        
-        # 获取图片信息
-        image_info = processor.get_image_info(image_path)
-        if image_info and 'width' in image_info and 'height' in image_info:
-            resolution = f"{image_info['width']} × {image_info['height']}"
-        
-        # 获取文件大小
-        if os.path.exists(image_path):
-            size_bytes = os.path.getsize(image_path)
-            file_size = format_file_size(size_bytes)
-        
-        return f"{resolution} | {file_size}"
-    except Exception as e:
-        logger.warning(f"获取图像信息失败: {e}")
-        return "信息获取失败"
+    return f"{width} × {height} | {format_file_size(size_bytes)}"
 
 
 def calculate_thumbnail_size(original_width: int, original_height: int, 
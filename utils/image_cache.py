@@ -45,10 +45,10 @@ class ImageCache:
         if cache_key in self._cache:
             # 移动到末尾（表示最近使用）
             self._cache.move_to_end(cache_key)
-            logger.debug(f"缓存命中: {cache_key}")
+            logger.debug("缓存命中: %s", cache_key)
             return self._cache[cache_key]
         
-        logger.debug(f"缓存未命中: {cache_key}")
+        logger.debug("缓存未命中: %s", cache_key)
         return None
     
     def put_thumbnail(self, image_path: str, size: Tuple[int, int], 
@@ -67,14 +67,14 @@ class ImageCache:
         if len(self._cache) >= self.max_cache_size and cache_key not in self._cache:
             oldest_key = next(iter(self._cache))
             self._remove_from_cache(oldest_key)
-            logger.debug(f"缓存已满，移除最旧项: {oldest_key}")
+            logger.debug("缓存已满，移除最旧项: %s", oldest_key)
         
         self._cache[cache_key] = photo_image
         self._cache_info[cache_key] = {
             'image_path': image_path,
             'size': size
         }
-        logger.debug(f"添加到缓存: {cache_key}")
+        logger.debug("添加到缓存: %s", cache_key)
     
     def load_and_cache(self, image_path: str, size: Tuple[int, int]) -> Optional[ImageTk.PhotoImage]:
         """
@@ -107,7 +107,7 @@ class ImageCache:
                 # 放入缓存
                 self.put_thumbnail(image_path, size, photo)
                 
-                logger.debug(f"加载并缓存图像: {image_path}")
+                logger.debug("加载并缓存图像: %s", image_path)
                 return photo
                 
         except Exception as e:
@@ -128,7 +128,7 @@ class ImageCache:
         
         for key in keys_to_remove:
             self._remove_from_cache(key)
-            logger.debug(f"使缓存失效: {key}")
+            logger.debug("使缓存失效: %s", key)
     
     def clear(self):
         """清空所有缓存"""
@@ -4,15 +4,26 @@ Pillow图片处理封装模块
 """
 
 import os
-from typing import Tuple, Optional, Dict, Any
-from PIL import Image, ImageOps
+import threading
+from typing import Optional, Dict, Any
+from PIL import Image
 
 class PillowWrapper:
     """Pillow图片处理封装类"""
     
     def __init__(self):
         """初始化Pillow封装器"""
-        self.last_error = None
+        # 错误信息按线程保存，批量并行处理时各线程互不覆盖
+        self._local = threading.local()
+    
+    @property
+    def last_error(self) -> Optional[str]:
+        """当前线程最近一次的错误信息"""
+        return getattr(self._local, 'last_error', None)
+    
+    @last_error.setter
+    def last_error(self, value: Optional[str]):
+        self._local.last_error = value
     
     def resize_by_percentage(self, input_path: str, output_path: str, 
                            percentage: float, quality: int = 85) -> bool:
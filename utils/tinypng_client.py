@@ -4,10 +4,13 @@ TinyPNG API客户端
 """
 
 import os
+import threading
 import requests
-import json
 from typing import Optional, Dict, Any
 
+# 验证密钥、查询次数等短请求的超时时间（秒），网络异常时后台验证也能及时结束
+_SHORT_REQUEST_TIMEOUT = 10
+
 class TinyPNGClient:
     """TinyPNG API客户端类"""
     
@@ -19,14 +22,31 @@ class TinyPNGClient:
         """
         self.api_key = api_key
         self.api_url = "https://api.tinify.com/shrink"
-        self.last_error = None
-        self.session = requests.Session()
-        
-        # 设置认证头
-        self.session.auth = (api_key, '')
-        self.session.headers.update({
-            'User-Agent': 'ImageForge/1.0'
-        })
+        # 批量压缩时多个线程共用同一个客户端，错误信息和会话按线程保存
+        self._local = threading.local()
+    
+    @property
+    def last_error(self) -> Optional[str]:
+        """当前线程最近一次的错误信息"""
+        return getattr(self._local, 'last_error', None)
+    
+    @last_error.setter
+    def last_error(self, value: Optional[str]):
+        self._local.last_error = value
+    
+    @property
+    def session(self) -> requests.Session:
+        """当前线程的 HTTP 会话（requests.Session 不保证线程安全，每个线程首次使用时创建）"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            # 设置认证头
+            session.auth = (self.api_key, '')
+            session.headers.update({
+                'User-Agent': 'ImageForge/1.0'
+            })
+            self._local.session = session
+        return session
     
     def compress_image(self, input_path: str, output_path: str) -> bool:
         """压缩单张图片
@@ -153,7 +173,8 @@ class TinyPNGClient:
             response = self.session.post(
                 self.api_url,
                 data=test_data,
-                headers={'Content-Type': 'application/octet-stream'}
+                headers={'Content-Type': 'application/octet-stream'},
+                timeout=_SHORT_REQUEST_TIMEOUT
             )
             
             return response.status_code in [200, 201, 400, 401]
@@ -168,7 +189,7 @@ class TinyPNGClient:
             int: 压缩次数，如果获取失败返回None
         """
         try:
-            response = self.session.get("https://api.tinify.com/shrink")
+            response = self.session.get("https://api.tinify.com/shrink", timeout=_SHORT_REQUEST_TIMEOUT)
             
             if response.status_code == 200:
                 # 从响应头获取压缩计数